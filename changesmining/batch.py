@@ -0,0 +1,149 @@
+"""
+Module to mine many repositories concurrently, each in a worker process of a bounded pool.
+
+The manifest is a json list of repositories:
+    [{"repository": "https://github.com/ShareX/ShareX.git", "tags": ["v12.0.0", "v13.0.0"]},
+     {"name": "local", "repository": "/path/to/repo", "commits": ["5c4e3d2"], "cumulative": false},
+     {"repository": "/path/to/other", "file_types": [".cs", ".java"], "detect_moves": true}]
+With tags or commits, the snapshots of main.mine_snapshots are saved; otherwise the changes of the whole history.
+The options file_types, changed_lines_engine, detect_moves, ownership_metrics and recent_days of main can be given
+for each repository; the others have the default value. The repositories with the same mirror in the cache are
+mined one after the other.
+Each repository is saved in its own folder (named by name, or by the repository), with the output of its mining
+in mining.log; a failed repository does not stop the others. The summary of the runs is saved in summary.csv.
+
+Example:
+    python batch.py repositories.json output --processes 4 --cache mirrors
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.repository import is_remote, mirror_path
+
+SUMMARY_COLUMNS = ['Name', 'Repository', 'Status', 'Commits', 'Seconds', 'Commits_per_sec', 'Error']
+
+
+def get_repository_name(entry: dict) -> str:
+    if entry.get('name'):
+        return entry['name']
+    name = os.path.basename(entry['repository'].rstrip('/\\'))
+    return name[:-len('.git')] if name.endswith('.git') else name
+
+
+def mine_repository(entry: dict, save_location: str, repository_cache: str = None, history: bool = False) -> dict:
+    """Mines one repository of the manifest in a new state; returns its row of the summary"""
+    import main
+
+    name = get_repository_name(entry)
+    result = {'Name': name, 'Repository': entry['repository'], 'Status': 'ok', 'Commits': 0, 'Seconds': 0.0,
+              'Commits_per_sec': 0.0, 'Error': ''}
+    os.makedirs(save_location, exist_ok=True)
+    start_time = time.perf_counter()
+    with open(os.path.join(save_location, 'mining.log'), 'w') as log, contextlib.redirect_stdout(log):
+        try:
+            main.reset_state()
+            # each option is set, none is kept from the repository mined before by the same process
+            main.repository_cache = repository_cache
+            main.file_types = tuple(entry.get('file_types', main.file_types))
+            main.changed_lines_engine = entry.get('changed_lines_engine', main.changed_lines_engine)
+            main.detect_moves = entry.get('detect_moves', main.detect_moves)
+            main.ownership_metrics = entry.get('ownership_metrics', main.ownership_metrics)
+            main.recent_days = entry.get('recent_days', main.recent_days)
+            if entry.get('tags') or entry.get('commits'):
+                main.mine_snapshots(entry['repository'], save_location, tags=entry.get('tags'),
+                                    commit_hashes=entry.get('commits'), cumulative=entry.get('cumulative', True),
+                                    history=history)
+            else:
+                main.mine_and_save_output(entry['repository'], save_location, history=history)
+        except Exception as e:
+            traceback.print_exc(file=log)
+            result['Status'] = 'failed'
+            result['Error'] = '{}: {}'.format(type(e).__name__, e)
+        result['Commits'] = len(main.mined_commits)
+        main.reset_state()
+
+    result['Seconds'] = time.perf_counter() - start_time
+    result['Commits_per_sec'] = result['Commits'] / result['Seconds'] if result['Seconds'] > 0 else 0.0
+    return result
+
+
+def mine_repository_group(group: list, save_location: str, repository_cache: str = None,
+                          history: bool = False) -> list:
+    """Mines the (name, entry) of the group one after the other; returns their rows of the summary"""
+    return [mine_repository(entry, os.path.join(save_location, name), repository_cache, history)
+            for name, entry in group]
+
+
+def mine_repositories(manifest: list, save_location: str, processes: int = None, repository_cache: str = None,
+                      history: bool = False) -> list:
+    """Mines the repositories of the manifest, at most processes at a time; returns the rows of the summary"""
+    names = [get_repository_name(entry) for entry in manifest]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError('The repositories {} have the same output folder, give them a name'.format(duplicates))
+
+    # a mirror is fetched at the start of each mining, two of them can not use it at the same time
+    groups = {}
+    for name, entry in zip(names, manifest):
+        if repository_cache is not None and is_remote(entry['repository']):
+            key = mirror_path(entry['repository'], repository_cache)
+        else:
+            key = name
+        groups.setdefault(key, []).append((name, entry))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as executor:
+        futures = {executor.submit(mine_repository_group, group, save_location, repository_cache, history): group
+                   for group in groups.values()}
+        for future in as_completed(futures):
+            try:
+                group_results = future.result()
+            except Exception as e:
+                # the worker process itself failed
+                group_results = [{'Name': name, 'Repository': entry['repository'], 'Status': 'failed', 'Commits': 0,
+                                  'Seconds': 0.0, 'Commits_per_sec': 0.0,
+                                  'Error': '{}: {}'.format(type(e).__name__, e)}
+                                 for name, entry in futures[future]]
+            for result in group_results:
+                results[result['Name']] = result
+                print('{} {}: {} commits in {:.1f}s ({:.2f} commits/sec) {}'.format(
+                    result['Status'], result['Name'], result['Commits'], result['Seconds'],
+                    result['Commits_per_sec'], result['Error']))
+
+    return [results[name] for name in names]
+
+
+def write_summary(results: list, file_path: str):
+    with open(file_path, 'w') as csvfile:
+        file_writer = csv.DictWriter(csvfile, SUMMARY_COLUMNS, delimiter=';', lineterminator='\n')
+        file_writer.writeheader()
+        for result in results:
+            file_writer.writerow(result)
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Mining of the repositories of a manifest')
+    parser.add_argument('manifest', help='json list of repositories')
+    parser.add_argument('output', help='folder of the outputs, one folder per repository')
+    parser.add_argument('--processes', type=int, help='repositories mined at the same time')
+    parser.add_argument('--cache', help='folder of the local mirrors of the remote repositories')
+    parser.add_argument('--history', action='store_true', help='save the changes per commit too')
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        repositories = json.load(f)
+    start = time.time()
+    summary = mine_repositories(repositories, args.output, args.processes, args.cache, args.history)
+    write_summary(summary, os.path.join(args.output, 'summary.csv'))
+
+    failed = [r['Name'] for r in summary if r['Status'] != 'ok']
+    print('{} repositories mined in {:.1f}s, {} failed {}'.format(len(summary), time.time() - start, len(failed),
+                                                                failed))
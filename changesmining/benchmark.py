@@ -0,0 +1,125 @@
+"""
+Module to benchmark the mining on generated repositories (see utils.synthetic).
+
+For each scenario a repository is generated and mined in a new process; the results (commits/sec, peak memory,
+seconds in get_pairs_of_similar_methods and compare_methods) are saved as json together with thresholds.
+Given the json of a previous run, the results are checked against its thresholds.
+
+Example:
+    python benchmark.py results.json
+    python benchmark.py new-results.json --check results.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from utils.synthetic import SyntheticRepository
+
+SCENARIOS = {
+    'edits': {'nr_commits': 200, 'nr_files': 20, 'methods_per_file': 10},
+    'renames': {'nr_commits': 200, 'nr_files': 20, 'methods_per_file': 10, 'rename_share': 0.3, 'move_share': 0.1},
+    'refactors': {'nr_commits': 100, 'nr_files': 10, 'methods_per_file': 40, 'refactor_share': 0.2},
+}
+
+# a result is a regression when it is worse than the previous one by more than the tolerance
+TOLERANCE = 0.25
+
+
+def run_scenario(config: dict) -> dict:
+    """Generates the repository and mines it; runs in its own process, so the peak memory is the mining one"""
+    import main
+
+    with tempfile.TemporaryDirectory() as tmp_folder:
+        repo = SyntheticRepository(os.path.join(tmp_folder, 'repo'), **config).generate()
+
+        main.stats.reset(True)
+        start_time = time.perf_counter()
+        main.mine(repo)
+        seconds = time.perf_counter() - start_time
+
+    # kilobytes on linux, bytes on macOS
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    if sys.platform == 'darwin':
+        peak_memory /= 1024
+    return {
+        'commits': len(main.mined_commits),
+        'seconds': seconds,
+        'commits_per_sec': len(main.mined_commits) / seconds,
+        'peak_memory_mb': peak_memory,
+        'similarity_seconds': main.stats.totals['similarity'],
+        'changed_lines_seconds': main.stats.totals['changed lines'],
+        'counters': dict(main.stats.counters)
+    }
+
+
+def get_thresholds(result: dict, tolerance: float = TOLERANCE) -> dict:
+    return {
+        'min_commits_per_sec': result['commits_per_sec'] * (1 - tolerance),
+        'max_peak_memory_mb': result['peak_memory_mb'] * (1 + tolerance),
+        'max_similarity_seconds': result['similarity_seconds'] * (1 + tolerance),
+        'max_changed_lines_seconds': result['changed_lines_seconds'] * (1 + tolerance)
+    }
+
+
+def check_thresholds(results: dict, previous: dict) -> list:
+    """Returns the descriptions of the results beyond the thresholds of the previous results"""
+    failures = []
+    for name, result in results.items():
+        if name not in previous:
+            continue
+        thresholds = previous[name]['thresholds']
+        for key, limit in thresholds.items():
+            bound, metric = key.split('_', 1)
+            value = result[metric]
+            if (bound == 'min' and value < limit) or (bound == 'max' and value > limit):
+                failures.append('{}: {} is {:.3f}, the threshold is {:.3f}'.format(name, metric, value, limit))
+    return failures
+
+
+def run_benchmark(scenarios: dict, tolerance: float = TOLERANCE) -> dict:
+    results = {}
+    for name, config in scenarios.items():
+        print('========================== benchmark {} =========================='.format(name))
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            result = executor.submit(run_scenario, config).result()
+        result['config'] = config
+        result['thresholds'] = get_thresholds(result, tolerance)
+        results[name] = result
+        print('{}: {:.1f} commits/sec, {:.1f} MB, similarity {:.3f}s, changed lines {:.3f}s'
+              .format(name, result['commits_per_sec'], result['peak_memory_mb'], result['similarity_seconds'],
+                      result['changed_lines_seconds']))
+    return results
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmark of the mining on generated repositories')
+    parser.add_argument('output', help='json file of the results')
+    parser.add_argument('--check', help='json file of previous results, whose thresholds are checked')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='scenarios to run')
+    parser.add_argument('--commits', type=int, help='number of commits of each scenario')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    use_scenarios = {name: dict(SCENARIOS[name]) for name in (args.scenario or SCENARIOS)}
+    if args.commits is not None:
+        for scenario in use_scenarios.values():
+            scenario['nr_commits'] = args.commits
+
+    benchmark_results = run_benchmark(use_scenarios, args.tolerance)
+    with open(args.output, 'w') as f:
+        json.dump(benchmark_results, f, indent=1)
+
+    if args.check is not None:
+        with open(args.check) as f:
+            regressions = check_thresholds(benchmark_results, json.load(f))
+        for regression in regressions:
+            print('Regression', regression)
+        sys.exit(1 if regressions else 0)
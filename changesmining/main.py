@@ -2,20 +2,118 @@
 Module to mine the given repository before or after a tag or commit hash.
 """
 
-from difflib import SequenceMatcher, Differ
-from typing import List
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List
+import os
+import re
 import time
-import copy
 
-from pydriller import RepositoryMining
+from pydriller import GitRepository, RepositoryMining
+from pydriller import Commit as PyDrillerCommit
 from pydriller.domain.commit import Method, Modification, ModificationType
+from utils.changedlines import count_changed_lines
 from utils.change import ChangedFile, ChangedMethod, Commit, MethodsSplit
-from utils.helpers import split_method_long_name, write_to_csv, write_to_cvs_trash
+from utils.helpers import split_method_long_name, write_to_csv, write_to_cvs_trash, save_checkpoint, load_checkpoint
+from utils.filetypes import is_file_type
+from utils.history import write_history
+from utils.instrumentation import MiningStats
+from utils.moves import MoveIndex
+from utils.ownership import RECENT_DAYS
+from utils.parsecache import ParseCache
+from utils.pipeline import ParsedCommit, iter_parsed_commits
+from utils.similarity import get_pairs_of_similar_methods
+from utils.sourcelines import ModificationLines, SourceLines
+from utils.store import MiningStore
+from utils.repository import get_modifications, get_modified_paths, local_repository, shared_clone
 
 
 changed_methods = {}
 files = {}
 commit_deleted_methods = {}
+mined_commits = []
+
+# SQLite store of files, commit_deleted_methods and mined_commits when set by use_store; None keeps them in memory
+store = None
+
+# 'opcodes' counts the same changed lines as 'differ', without building the whole Differ output
+changed_lines_engine = 'opcodes'
+
+# extensions of the mined files; utils.filetypes.get_file_types gives those of other lizard languages
+file_types = ('.cs',)
+
+# folder of the local mirrors of the remote repositories; None clones them in a temporary folder for each run
+repository_cache = None
+
+# lizard analyses of the sources by blob; use_parse_cache keeps them in a file for the next runs, None disables it
+parse_cache = ParseCache()
+
+# when True, the changes csv files have the author and ownership metrics of the methods (see utils.ownership)
+ownership_metrics = False
+recent_days = RECENT_DAYS
+
+# time and counters of the mining, enabled by the instrument argument of the mine*_and_save_output functions
+stats = MiningStats()
+
+# lines of the modifications being processed, split once per modification
+modification_lines = {}
+
+# when True, the methods moved to another file keep their history (see resolve_moves); only the moves within a
+# commit are found, the index of the removed methods is cleared after each commit
+detect_moves = False
+
+# the methods removed and added by the commit being mined, to find those moved to another file
+move_index = MoveIndex()
+removed_methods = []
+added_methods = []
+
+
+def reset_state():
+    """Starts a new run in the same process: empties the state of the mining, kept in memory (a store is closed),
+    and sets the options back to their defaults"""
+    global store, files, commit_deleted_methods, mined_commits
+    global changed_lines_engine, file_types, repository_cache, parse_cache, ownership_metrics, recent_days, \
+        detect_moves
+    if store is not None:
+        store.close()
+    store = None
+    files, commit_deleted_methods, mined_commits = {}, {}, []
+    changed_methods.clear()
+    modification_lines.clear()
+    move_index.clear()
+    removed_methods.clear()
+    added_methods.clear()
+    stats.reset(False)
+
+    changed_lines_engine = 'opcodes'
+    file_types = ('.cs',)
+    repository_cache = None
+    if parse_cache is not None:
+        parse_cache.close()
+    parse_cache = ParseCache()
+    ownership_metrics = False
+    recent_days = RECENT_DAYS
+    detect_moves = False
+
+
+def use_store(store_path: str):
+    """Keeps the mining state in a SQLite database instead of memory; the state of an existing database is continued"""
+    global store, files, commit_deleted_methods, mined_commits
+    store = MiningStore(store_path)
+    files, commit_deleted_methods, mined_commits = store.files, store.trash, store.commits
+
+
+def use_parse_cache(parse_cache_path: str):
+    """Keeps the lizard analyses in a SQLite database too, so a new mining of the same history parses no source"""
+    global parse_cache
+    if parse_cache is not None:
+        parse_cache.close()
+    parse_cache = ParseCache(path=parse_cache_path)
+
+
+def is_mined_file(filename: str) -> bool:
+    return is_file_type(filename, file_types)
 
 
 def search_modified_file_or_create(filename: str, full_path: str) -> ChangedFile:
@@ -42,13 +140,12 @@ def update_modified_file(filename: str, old_full_path: str, new_full_path: str)
 
 
 def search_matches_for_method(changed_file: ChangedFile, method_long_name: str):
-    matches = [m for m in changed_file.methods
-               if (m.class_path + m.name).replace(' ', '') == method_long_name.replace(' ', '')]
+    matches = changed_file.find_by_long_name(method_long_name)
     if len(matches) == 0:
         sig, _ = split_method_long_name(method_long_name)
         # can be the case that two different commits change the method signature in different ways (e.g. merge)
         # try to search for a method with the same name
-        matches = [m for m in changed_file.methods if m.name[:m.name.rfind('(')] == sig[:sig.rfind('(')]]
+        matches = changed_file.find_by_name(sig)
         # if there are more matches with the same name;
         # return an empty list such that the method will be added as new
         if len(matches) > 1:
@@ -68,57 +165,47 @@ def get_matches_for_method(changed_file: ChangedFile, commit_hash: str, method_l
     return matches
 
 
-def create_method_using_str(changed_file: ChangedFile, method_long_name: str, commit: Commit):
+def create_method_using_str(changed_file: ChangedFile, method_long_name: str, commit: Commit, changed_lines: int = 0):
     method_signature, class_path = split_method_long_name(method_long_name)
 
     m = ChangedMethod(method_signature, class_path)
-    m.commits.append(commit)
-    changed_file.methods.append(m)
+    m.add_change(commit, changed_lines)
+    changed_file.add_method(m)
+    return m
 
 
-def update_or_create_method_using_str(changed_file: ChangedFile, method_long_name: str, commit: Commit):
+def update_or_create_method_using_str(changed_file: ChangedFile, method_long_name: str, commit: Commit,
+                                      changed_lines: int = 0):
     matches = get_matches_for_method(changed_file, commit.commit_hash, method_long_name)
 
     if len(matches) == 1:
-        matches[0].commits.append(commit)
+        matches[0].add_change(commit, changed_lines)
     elif len(matches) == 0:
-        create_method_using_str(changed_file, method_long_name, commit)
+        create_method_using_str(changed_file, method_long_name, commit, changed_lines)
 
 
-def add_methods(changed_file: ChangedFile, methods: List[Method], commit: Commit):
+def add_methods(modification: Modification, changed_file: ChangedFile, methods: List[Method], commit: Commit):
     for m in methods:
-        create_method_using_str(changed_file, m.long_name, commit)
+        c_m = create_method_using_str(changed_file, m.long_name, commit)
+        if detect_moves:
+            added_methods.append((changed_file, c_m, get_modification_lines(modification).current.method_content(m)))
 
 
-def get_method_content(source_code_lines):
-    # trim whitespaces
-    source_code_lines = [line.strip(' \t\n') for line in source_code_lines]
-    cnt_start = 0
-    for i in range(len(source_code_lines)):
-        if '{' in source_code_lines[i]:
-            cnt_start = i
-            break
-    return source_code_lines[cnt_start:]
+def get_modification_lines(modification: Modification) -> ModificationLines:
+    key = id(modification)
+    if key not in modification_lines:
+        modification_lines[key] = ModificationLines(modification)
+    return modification_lines[key]
 
 
 def compare_methods(modification: Modification, method: Method, prev_method: Method) -> int:
-    text_before = modification.source_code_before.splitlines()[prev_method.start_line: prev_method.end_line]
-    text_current = modification.source_code.splitlines()[method.start_line: method.end_line]
-
-    text_before = get_method_content(text_before)
-    text_current = get_method_content(text_current)
+    lines = get_modification_lines(modification)
+    text_before = lines.before.method_content(prev_method)
+    text_current = lines.current.method_content(method)
 
-    d = Differ()
-    result = list(d.compare(text_before, text_current))
-
-    changed_lines = 0
-    for line in result:
-        if line.startswith('-'):
-            line = line[1:].strip(" \n")
-            if not line.startswith('//') and len(line) > 1:
-                changed_lines += 1
-
-    return changed_lines
+    stats.count('changed lines comparisons')
+    with stats.phase('changed lines'):
+        return count_changed_lines(text_before, text_current, changed_lines_engine)
 
 
 def get_number_of_changed_lines(modification: Modification, current_method: Method, prev_method: Method = None):
@@ -136,13 +223,13 @@ def get_number_of_changed_lines(modification: Modification, current_method: Meth
 
 def update_or_create_method(modification: Modification, changed_file: ChangedFile, method: Method, commit: Commit):
 
-    commit_copy = copy.deepcopy(commit)
+    changed_lines = 0
     try:
-        commit_copy.changed_lines = get_number_of_changed_lines(modification, current_method=method)
+        changed_lines = get_number_of_changed_lines(modification, current_method=method)
     except Exception as e:
         print(e, "Commit msg: '{}' , hash {}".format(commit.msg, commit.commit_hash))
 
-    update_or_create_method_using_str(changed_file, method.long_name, commit_copy)
+    update_or_create_method_using_str(changed_file, method.long_name, commit, changed_lines)
 
 
 def update_methods(modification: Modification, c_file: ChangedFile, methods: List[Method], commit: Commit):
@@ -152,9 +239,9 @@ def update_methods(modification: Modification, c_file: ChangedFile, methods: Lis
 
 def replace_and_update_method(modification: Modification, c_file: ChangedFile, commit: Commit,
                               before_m: Method, new_m: Method):
-    commit_copy = copy.deepcopy(commit)
+    changed_lines = 0
     try:
-        commit_copy.changed_lines = get_number_of_changed_lines(modification, current_method=new_m, prev_method=before_m)
+        changed_lines = get_number_of_changed_lines(modification, current_method=new_m, prev_method=before_m)
     except Exception as e:
         print(e, "Commit msg: '{}' , hash {}".format(commit.msg, commit.commit_hash))
 
@@ -165,9 +252,8 @@ def replace_and_update_method(modification: Modification, c_file: ChangedFile, c
 
     if len(matches) == 1:
         signature, class_path = split_method_long_name(new_long_name)
-        matches[0].name = signature
-        matches[0].class_path = class_path
-        matches[0].commits.append(commit_copy)
+        c_file.rename_method(matches[0], signature, class_path)
+        matches[0].add_change(commit, changed_lines)
     else:
         print('Method not found {}, or too many matches. Current matches {}'.format(old_long_name, matches))
         print("Commit msg: '{}', hash {}".format(commit.msg, commit.commit_hash))
@@ -187,22 +273,25 @@ def update_or_create_methods(modification: Modification, c_file: ChangedFile,
 def update_all_methods_with_new_class(c_file: ChangedFile, current_path: str, new_class_path: str):
     for m in c_file.methods:
         if m.class_path == current_path:
-            m.class_path = new_class_path
+            c_file.rename_method(m, m.name, new_class_path)
             break
 
 
 def update_methods_with_new_class(c_file: ChangedFile, methods: List[str], current_path: str, new_class_path: str):
-    for m in c_file.methods:
-        long_name = m.class_path + m.name
-        if (long_name in methods) and (m.class_path == current_path):
-            m.class_path = new_class_path
+    to_update = []
+    for long_name in set(methods):
+        if long_name.startswith(current_path):
+            to_update += [m for m in c_file.find_by_long_name(long_name)
+                          if (m.class_path + m.name) == long_name and m.class_path == current_path]
+    for m in to_update:
+        c_file.rename_method(m, m.name, new_class_path)
 
 
 def update_method_with_new_class(c_file: ChangedFile, method_name: str, current_path: str, new_class_path: str):
-    for m in c_file.methods:
-        if (m.class_path == current_path) and (m.name == method_name):
-            m.class_path = new_class_path
-            break
+    matches = [m for m in c_file.find_by_long_name(current_path + method_name)
+               if (m.class_path == current_path) and (m.name == method_name)]
+    if matches:
+        c_file.rename_method(matches[0], method_name, new_class_path)
 
 
 def add_to_trash(methods: List[ChangedMethod], commit: Commit):
@@ -212,48 +301,50 @@ def add_to_trash(methods: List[ChangedMethod], commit: Commit):
         commit_deleted_methods[commit] = [methods]
 
 
-def remove_methods(c_file: ChangedFile, obsolete_methods: List[str], commit: Commit):
-    to_remove = [m for m in c_file.methods if (m.class_path + m.name) in obsolete_methods]
-    c_file.methods = [m for m in c_file.methods if m not in to_remove]
-    add_to_trash(to_remove, commit)
+def trash_methods(modification: Modification, c_file: ChangedFile, methods: List[ChangedMethod], commit: Commit):
+    """Adds the removed methods to the trash; with detect_moves, when the commit is resolved (see resolve_moves)"""
+    if not detect_moves:
+        add_to_trash(methods, commit)
+        return
+    before_methods = get_methods_by_long_name(modification.methods_before)
+    lines = get_modification_lines(modification)
+    for m in methods:
+        before_m = before_methods.get(m.class_path + m.name)
+        if before_m is not None:
+            move_index.add(m, lines.before.method_content(before_m), c_file)
+    removed_methods.append(methods)
+
+
+def remove_methods(modification: Modification, c_file: ChangedFile, obsolete_methods: List[str], commit: Commit):
+    to_remove = [m for long_name in set(obsolete_methods) for m in c_file.find_by_long_name(long_name)
+                 if (m.class_path + m.name) == long_name]
+    trash_methods(modification, c_file, c_file.remove_methods(to_remove), commit)
 
 
 def get_methods_before(modification: Modification, methods: List[Method]) -> List[Method]:
-    methods_long_names = [m.long_name for m in methods]
+    methods_long_names = {m.long_name for m in methods}
     result = [m for m in modification.methods_before if m.long_name in methods_long_names]
 
     return result
 
 
-def get_dict_content_of_methods(source_code: str, methods: List[Method]):
+def get_methods_by_long_name(*methods_lists: List[Method]) -> dict:
+    """Maps each long name to the first method with that name in the given lists"""
     methods_dict = {}
-    for m in methods:
-        content = source_code.splitlines()[m.start_line: m.end_line]
-        sig, _ = split_method_long_name(m.long_name)
-        content.insert(0, sig)  # add also the signature of the method (name + parameters)
-        methods_dict[m.long_name] = content
+    for methods in methods_lists:
+        for m in methods:
+            methods_dict.setdefault(m.long_name, m)
     return methods_dict
 
 
-def get_pairs_of_similar_methods(dict_methods1, dict_methods2):
-    pairs = []
-    copy_dict_methods2 = dict_methods2.copy()
-    for k1, c1 in dict_methods1.items():
-        sm = SequenceMatcher(isjunk=lambda x: x in " \t")  # ignore spaces and tabs
-        sm.set_seq2(''.join(c1))
-        to_replace = ('', '', 0)
-        for k2, c2 in copy_dict_methods2.items():
-            sm.set_seq1(''.join(c2))
-            sim = sm.ratio()
-            if sim > to_replace[2]:
-                to_replace = (k1, k2, sim)
+def pair_similar_methods(d_before: dict, d_current: dict):
+    stats.count('similarity comparisons', len(d_before) * len(d_current))
+    with stats.phase('similarity'):
+        return get_pairs_of_similar_methods(d_before, d_current)
 
-        m1, m2, similarity = to_replace
-        if similarity >= 0.6:
-            pairs.append((m1, m2))
-            copy_dict_methods2.pop(m2)  # remove it to don't check it again
 
-    return pairs
+def get_dict_content_of_methods(source_lines: SourceLines, methods: List[Method]):
+    return {m.long_name: source_lines.method_text(m) for m in methods}
 
 
 def get_map_of_methods(methods: List[str]):
@@ -269,15 +360,14 @@ def get_map_of_methods(methods: List[str]):
     return methods_dict
 
 
+# a removed line (the line breaks are those of str.splitlines) declaring a namespace, class or struct
+_LINE_BREAKS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+_removed_declaration = re.compile('(?:^|(?<=[{0}]))-[^{0}]*?(?:namespace |class |struct )'.format(_LINE_BREAKS),
+                                  re.IGNORECASE | re.ASCII)
+
+
 def possible_rename_check(mod: Modification):
-    diff = mod.diff.splitlines(1)
-    for i in range(len(diff)):
-        line = diff[i].lower()
-        if line.startswith('-') and (("namespace " in line)
-                                     or ("class " in line)
-                                     or ("struct " in line)):
-            return True
-    return False
+    return _removed_declaration.search(mod.diff) is not None
 
 
 def check_for_rename(modification: Modification, c_file: ChangedFile, methods: MethodsSplit) -> dict:
@@ -290,112 +380,121 @@ def check_for_rename(modification: Modification, c_file: ChangedFile, methods: M
     before_dict = get_map_of_methods(before)
     current_dict = get_map_of_methods(current)
 
+    # the current classes by their sorted methods
+    current_by_methods = {}
+    for cls_path, methods in current_dict.items():
+        current_by_methods.setdefault(tuple(methods), []).append(cls_path)
+
     renamed = {}
 
     for b_cls_path, b_methods in before_dict.items():
-        for cls_path, methods in current_dict.items():
-            if (b_methods == methods) and (b_cls_path != cls_path):
+        for cls_path in current_by_methods.get(tuple(b_methods), []):
+            if b_cls_path != cls_path:
                 # replace b_cls_path with cls_path
-                update_methods_with_new_class(c_file, before, b_cls_path, cls_path)
+                update_methods_with_new_class(c_file, [b_cls_path + m for m in b_methods], b_cls_path, cls_path)
                 renamed[b_cls_path] = cls_path
                 break
     return renamed
 
 
 def check_current_methods(modification, c_file, commit):
-    added_methods = [(m.class_path + m.name) for m in c_file.methods]
-    for c_m in modification.methods:
-        if c_m.long_name not in added_methods:
-            print('{} was not present; commit {}'.format(c_m.long_name, commit.commit_hash))
-            create_method_using_str(c_file, c_m.long_name, commit)
+    missing = [c_m for c_m in modification.methods if not c_file.has_long_name(c_m.long_name)]
+    for c_m in missing:
+        print('{} was not present; commit {}'.format(c_m.long_name, commit.commit_hash))
+        create_method_using_str(c_file, c_m.long_name, commit)
 
 
-def handle_new_updated(modification: Modification, m_new, m_updated,
-                       c_file: ChangedFile, commit: Commit):
+def handle_new_updated(modification: Modification, methods: MethodsSplit, c_file: ChangedFile, commit: Commit):
+    m_new, m_updated = methods.new, methods.updated
+    lines = get_modification_lines(modification)
     updated_before = get_methods_before(modification, m_updated)
-    d_updated_before = get_dict_content_of_methods(modification.source_code_before, updated_before)
+    d_updated_before = get_dict_content_of_methods(lines.before, updated_before)
 
-    d_new = get_dict_content_of_methods(modification.source_code, m_new)
-    d_updated = get_dict_content_of_methods(modification.source_code, m_updated)
+    d_new = get_dict_content_of_methods(lines.current, m_new)
+    d_updated = get_dict_content_of_methods(lines.current, m_updated)
     d_current = {**d_new, **d_updated}
 
-    m_pairs = get_pairs_of_similar_methods(d_updated_before, d_current)
+    m_pairs = pair_similar_methods(d_updated_before, d_current)
 
     for before_m_name, current_m_name in m_pairs:
-        before_m = next(m for m in updated_before if m.long_name == before_m_name)
-        current_m = next(m for m in (m_new + m_updated) if m.long_name == current_m_name)
+        before_m = methods.before_by_long_name[before_m_name]
+        current_m = methods.current_by_long_name[current_m_name]
         replace_and_update_method(modification, c_file, commit, before_m, current_m)
         d_current.pop(current_m_name)
 
     # add or update the rest
-    rest_new = [m for m in m_new if m.long_name in list(d_current.keys())]
-    add_methods(c_file, rest_new, commit)
-    rest_updated = [m for m in m_updated if m.long_name in list(d_current.keys())]
+    rest_new = [m for m in m_new if m.long_name in d_current]
+    add_methods(modification, c_file, rest_new, commit)
+    rest_updated = [m for m in m_updated if m.long_name in d_current]
     update_or_create_methods(modification, c_file, rest_updated, commit)
 
 
-def handle_new_obsolete(modification: Modification, m_new, m_obsolete,
-                        c_file: ChangedFile, commit: Commit):
-    d_obsolete = get_dict_content_of_methods(modification.source_code_before, m_obsolete)
+def handle_new_obsolete(modification: Modification, methods: MethodsSplit, c_file: ChangedFile, commit: Commit):
+    m_new, m_obsolete = methods.new, methods.obsolete
+    lines = get_modification_lines(modification)
+    d_obsolete = get_dict_content_of_methods(lines.before, m_obsolete)
 
-    d_new = get_dict_content_of_methods(modification.source_code, m_new)
+    d_new = get_dict_content_of_methods(lines.current, m_new)
 
-    m_pairs = get_pairs_of_similar_methods(d_obsolete, d_new)
+    m_pairs = pair_similar_methods(d_obsolete, d_new)
 
     for before_m_name, current_m_name in m_pairs:
-        before_m = next(m for m in m_obsolete if m.long_name == before_m_name)
-        current_m = next(m for m in m_new if m.long_name == current_m_name)
+        before_m = methods.before_by_long_name[before_m_name]
+        current_m = methods.current_by_long_name[current_m_name]
         replace_and_update_method(modification, c_file, commit, before_m, current_m)
         d_obsolete.pop(before_m_name)
         d_new.pop(current_m_name)
 
     # add or update the rest
-    rest = [m for m in m_new if m.long_name in list(d_new.keys())]
-    add_methods(c_file, rest, commit)
+    rest = [m for m in m_new if m.long_name in d_new]
+    add_methods(modification, c_file, rest, commit)
 
     # remove the rest of obsolete
-    remove_methods(c_file, list(d_obsolete.keys()), commit)
-
+    remove_methods(modification, c_file, list(d_obsolete.keys()), commit)
 
-def handle_new_obsolete_updated(modification: Modification, m_new: List[Method], m_obsolete: List[Method],
-                                m_updated: List[Method], c_file: ChangedFile, commit: Commit):
 
+def handle_new_obsolete_updated(modification: Modification, methods: MethodsSplit,
+                                c_file: ChangedFile, commit: Commit):
+    m_new, m_obsolete, m_updated = methods.new, methods.obsolete, methods.updated
+    lines = get_modification_lines(modification)
     updated_before = get_methods_before(modification, m_updated)
-    d_updated_before = get_dict_content_of_methods(modification.source_code_before, updated_before)
-    d_obsolete = get_dict_content_of_methods(modification.source_code_before, m_obsolete)
+    d_updated_before = get_dict_content_of_methods(lines.before, updated_before)
+    d_obsolete = get_dict_content_of_methods(lines.before, m_obsolete)
     d_before = {**d_updated_before, **d_obsolete}
 
-    d_new = get_dict_content_of_methods(modification.source_code, m_new)
-    d_updated = get_dict_content_of_methods(modification.source_code, m_updated)
+    d_new = get_dict_content_of_methods(lines.current, m_new)
+    d_updated = get_dict_content_of_methods(lines.current, m_updated)
     d_current = {**d_new, **d_updated}
 
-    m_pairs = get_pairs_of_similar_methods(d_before, d_current)
+    m_pairs = pair_similar_methods(d_before, d_current)
 
     for before_m_name, current_m_name in m_pairs:
-        before_m = next(m for m in (m_obsolete + updated_before) if m.long_name == before_m_name)
-        current_m = next(m for m in (m_new + m_updated) if m.long_name == current_m_name)
+        before_m = methods.before_by_long_name[before_m_name]
+        current_m = methods.current_by_long_name[current_m_name]
         replace_and_update_method(modification, c_file, commit, before_m, current_m)
         d_before.pop(before_m_name)
         d_current.pop(current_m_name)
 
     # add or update the rest
-    rest_new = [m for m in m_new if m.long_name in list(d_current.keys())]
-    add_methods(c_file, rest_new, commit)
-    rest_updated = [m for m in m_updated if m.long_name in list(d_current.keys())]
+    rest_new = [m for m in m_new if m.long_name in d_current]
+    add_methods(modification, c_file, rest_new, commit)
+    rest_updated = [m for m in m_updated if m.long_name in d_current]
     update_or_create_methods(modification, c_file, rest_updated, commit)
 
     # remove the rest of obsolete
-    remove_methods(c_file, list(d_before.keys()), commit)
+    remove_methods(modification, c_file, list(d_before.keys()), commit)
 
 
 def check_and_update_methods(modification: Modification, c_file: ChangedFile, commit: Commit):
-    methods = MethodsSplit(modification)
+    with stats.phase('methods split'):
+        methods = MethodsSplit(modification)
 
-    renamed = check_for_rename(modification, c_file, methods)
+    with stats.phase('rename check'):
+        renamed = check_for_rename(modification, c_file, methods)
 
     if methods.exist_new() and not methods.exist_obsolete() and not methods.exist_updated():
         # add all
-        add_methods(c_file, methods.new, commit)
+        add_methods(modification, c_file, methods.new, commit)
 
     elif methods.exist_updated() and not methods.exist_new() and not methods.exist_obsolete():
         # update all
@@ -403,121 +502,503 @@ def check_and_update_methods(modification: Modification, c_file: ChangedFile, co
 
     elif methods.exist_obsolete() and not methods.exist_new() and not methods.exist_updated():
         # remove all
-        remove_methods(c_file, methods.names_obsolete, commit)
+        remove_methods(modification, c_file, methods.names_obsolete, commit)
 
     elif methods.exist_obsolete() and methods.exist_updated() and not methods.exist_new():
         # remove obsolete and update the updated methods
-        remove_methods(c_file, methods.names_obsolete, commit)
+        remove_methods(modification, c_file, methods.names_obsolete, commit)
         update_methods(modification, c_file, methods.updated, commit)
 
     elif methods.exist_new() and methods.exist_updated() and not methods.exist_obsolete():
         # get updated before and do similarity check between these and new + current updated
         # maybe the content of a new method is actually an updated method
-        handle_new_updated(modification, methods.new, methods.updated, c_file, commit)
+        handle_new_updated(modification, methods, c_file, commit)
 
     elif methods.exist_new() and methods.exist_obsolete() and not methods.exist_updated():
         # get obsolete and do similarity check between these and new
         # maybe the content of a new method is actually an obsolete method; rename
-        handle_new_obsolete(modification, methods.new, methods.obsolete, c_file, commit)
+        handle_new_obsolete(modification, methods, c_file, commit)
 
     else:  # obsolete & new & updated
         # get obsolete and updated before and check between those and new + current updated
-        handle_new_obsolete_updated(modification, methods.new, methods.obsolete, methods.updated, c_file, commit)
+        handle_new_obsolete_updated(modification, methods, c_file, commit)
 
     # check if the file has all the current methods; add those missing
     check_current_methods(modification, c_file, commit)
 
 
 def reset_changed_methods_and_save_name():
+    if store is not None:
+        store.files.reset_changes()
+        return
     for _, changed_file in files.items():
         for m in changed_file.methods:
             m.previous_long_name = m.class_path + m.name
-            m.commits.clear()
+            m.clear_changes()
 
 
-def mine(repository: str, from_tag: str = None, to_tag: str = None,
-         from_com: str = None, to_com: str = None):
+def process_modification(mod: Modification, commit: Commit):
+    stats.count('modifications')
+    try:
+        if mod.change_type == ModificationType.ADD:
+            # add all methods for file
+            c_file = search_modified_file_or_create(mod.filename, mod.new_path)
+            with stats.phase('lizard'):
+                methods = mod.methods
+            stats.count('methods', len(methods))
+            add_methods(mod, c_file, methods, commit)
+        elif mod.change_type == ModificationType.DELETE:
+            # delete file (and its methods)
+            if mod.old_path in files:
+                removed = files.pop(mod.old_path)
+                trash_methods(mod, removed, removed.methods, commit)
+        else:
+            if mod.change_type == ModificationType.RENAME:
+                c_file = update_modified_file(mod.filename, mod.old_path, mod.new_path)
+            else:
+                c_file = search_modified_file_or_create(mod.filename, mod.new_path)
+
+            if stats.enabled:
+                # parsed here to be timed apart; otherwise the methods are parsed on the first use
+                with stats.phase('lizard'):
+                    stats.count('methods', len(mod.methods) + len(mod.methods_before))
+
+            check_and_update_methods(mod, c_file, commit)
+    finally:
+        modification_lines.pop(id(mod), None)
+
+
+def resolve_moves(commit: Commit):
+    """Finds the methods added by the commit whose body is one of a method removed from another file.
+
+    The added method continues the history of the removed one, which is not added to the trash; the change of
+    the commit counts the lines changed by the move.
+    """
+    moved = set()
+    for c_file, c_m, content in added_methods:
+        match = move_index.pop_match(content, c_file)
+        if match is None:
+            continue
+        removed_m, removed_content = match
+        c_m.changes[0:0] = removed_m.changes
+        c_m.changes[-1] = count_changed_lines(removed_content, content, changed_lines_engine)
+        c_m.previous_long_name = removed_m.previous_long_name
+        moved.add(removed_m)
+    stats.count('moved methods', len(moved))
+
+    for methods in removed_methods:
+        rest = [m for m in methods if m not in moved]
+        if rest or not methods:
+            add_to_trash(rest, commit)
+    move_index.clear()
+    removed_methods.clear()
+    added_methods.clear()
+
+
+def create_commit(c: PyDrillerCommit, index: int = None) -> Commit:
+    """Creates the single Commit object of the mined commit; by default its index is its position in mined_commits"""
+    commit = Commit(len(mined_commits) if index is None else index, c.committer_date, c.committer, c.msg, c.hash)
+    mined_commits.append(commit)
+    return commit
+
+
+def restore_checkpoint(checkpoint: str) -> str:
+    """Loads the saved state in files, commit_deleted_methods and mined_commits; returns the last mined commit"""
+    saved_files, saved_deleted_methods, saved_commits, last_commit = load_checkpoint(checkpoint)
+    files.clear()
+    files.update(saved_files)
+    commit_deleted_methods.clear()
+    commit_deleted_methods.update(saved_deleted_methods)
+    mined_commits.clear()
+    mined_commits.extend(saved_commits)
+    print('Resume mining after commit {}'.format(last_commit))
+    return last_commit
+
+
+def mine_commits(commits: Iterable[PyDrillerCommit]) -> str:
+    """Mines the given commits (or commits parsed by utils.pipeline) in order; returns the hash of the last one"""
+    last_commit = None
     c_count = 0
-    for c in RepositoryMining(repository,
-                              from_tag=from_tag,
-                              to_tag=to_tag,
-                              from_commit=from_com,
-                              to_commit=to_com
-                              ).traverse_commits():
-
-        commit = Commit(c.committer_date, c.committer, c.msg, c.hash)
+    for c in commits:
+        last_commit = c.hash
+        stats.start_commit(c.hash)
+        commit = create_commit(c)
         count_commit = False
 
-        for mod in c.modifications:
-            if not mod.filename.endswith('.cs'):
-                continue
+        if isinstance(c, ParsedCommit):
+            modifications = c.modifications
+        else:
+            with stats.phase('git diff'):
+                modifications = get_modifications(c, is_mined_file, parse_cache)
+        for mod in modifications:
             count_commit = True
-            # try:
-            if mod.change_type == ModificationType.ADD:
-                # add all methods for file
-                c_file = search_modified_file_or_create(mod.filename, mod.new_path)
-                add_methods(c_file, mod.methods, commit)
-            elif mod.change_type == ModificationType.DELETE:
-                # delete file (and its methods)
-                if mod.old_path in files:
-                    removed = files.pop(mod.old_path)
-                    add_to_trash(removed.methods, commit)
-            else:
-                if mod.change_type == ModificationType.RENAME:
-                    c_file = update_modified_file(mod.filename, mod.old_path, mod.new_path)
-                else:
-                    c_file = search_modified_file_or_create(mod.filename, mod.new_path)
-
-                check_and_update_methods(mod, c_file, commit)
+            process_modification(mod, commit)
+        if detect_moves:
+            resolve_moves(commit)
         if count_commit:
             c_count += 1
+        if store is not None:
+            store.flush(last_commit)
+        stats.end_commit()
 
     print("commits parsed: ", c_count)
+    return last_commit
 
 
-def mine_and_save_output(repo: str, save_location: str):
-    print('========================== mine ==========================')
-    start_time = time.time()
+def mine(repository: str, from_tag: str = None, to_tag: str = None,
+         from_com: str = None, to_com: str = None, checkpoint: str = None, workers: int = None):
+    """Mines the commits and updates files and commit_deleted_methods.
+
+    With workers, the commits are read and parsed by that many processes ahead of the mining (see utils.pipeline).
+
+    If a checkpoint file is given, the state is saved in it at the end; if it already exists, the state is
+    restored first and only the commits after the last mined commit are processed. A store (see use_store)
+    is saved after each commit and is continued in the same way.
+    """
+    last_commit = None
+    if store is not None and checkpoint is not None:
+        raise ValueError('The state is saved in the store, a checkpoint can not be used with it')
+    if checkpoint is not None and os.path.exists(checkpoint):
+        last_commit = restore_checkpoint(checkpoint)
+        from_tag, from_com = None, last_commit
+    elif store is not None and store.last_commit is not None:
+        last_commit = store.last_commit
+        print('Resume mining after commit {}'.format(last_commit))
+        from_tag, from_com = None, last_commit
+
+    with local_repository(repository, repository_cache) as path_to_repo:
+        commits = RepositoryMining(path_to_repo,
+                                   from_tag=from_tag,
+                                   to_tag=to_tag,
+                                   from_commit=from_com,
+                                   to_commit=to_com
+                                   ).traverse_commits()
+        # the range starts with the last commit of the checkpoint; it is already mined
+        commits = (c for c in commits if c.hash != last_commit)
+        if workers is not None:
+            commits = iter_parsed_commits(path_to_repo, [c.hash for c in commits], file_types, workers,
+                                          parse_cache)
+        last_commit = mine_commits(commits) or last_commit
+
+    if checkpoint is not None and last_commit is not None:
+        save_checkpoint(files, commit_deleted_methods, mined_commits, last_commit, checkpoint)
+
+
+# --------- Parallel mining --------- #
+
+def get_file_shards(path_to_repo: str, hashes: List[str], nr_shards: int):
+    """Groups the files connected by renames and splits them in shards with a similar number of modifications.
+
+    Returns the number of commits with modified files and, for each shard, the set of paths and the list of commits.
+    """
+    modified_paths = get_modified_paths(path_to_repo, hashes)
+
+    parent = {}
+
+    def find(path):
+        parent.setdefault(path, path)
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    commit_paths = {}
+    for h in hashes:
+        paths = []
+        for _, old_path, new_path in modified_paths[h]:
+            if not is_mined_file(os.path.basename(new_path or old_path)):
+                continue
+            mod_paths = [str(Path(p)) for p in (old_path, new_path) if p is not None]
+            # a renamed file keeps its history, so both paths go in the same group
+            parent[find(mod_paths[0])] = find(mod_paths[-1])
+            paths += mod_paths
+        if paths:
+            commit_paths[h] = paths
+
+    groups = {}
+    for path in parent:
+        groups.setdefault(find(path), set()).add(path)
+
+    group_commits = {root: [] for root in groups}
+    for h, paths in commit_paths.items():
+        for root in {find(p) for p in paths}:
+            group_commits[root].append(h)
+
+    # the largest groups first, each to the shard with the least modifications
+    shards = [(0, i, set(), set()) for i in range(nr_shards)]
+    for root in sorted(groups, key=lambda r: len(group_commits[r]), reverse=True):
+        load, i, paths, commits = min(shards)
+        paths.update(groups[root])
+        commits.update(group_commits[root])
+        shards[i] = (load + len(group_commits[root]), i, paths, commits)
+
+    return len(commit_paths), [(paths, [h for h in hashes if h in commits]) for _, _, paths, commits in shards if paths]
+
+
+def mine_shard(repository: str, paths: set, commits: List[str], positions: dict, from_tag: str = None,
+               to_tag: str = None, from_com: str = None, to_com: str = None):
+    """Mines only the modifications of the given paths; returns the state to be merged with the other shards"""
+    files.clear()
+    commit_deleted_methods.clear()
+    mined_commits.clear()
+    file_positions = {}
+    shard_trash = []
+
+    with shared_clone(repository) as path_to_repo:
+        for c in RepositoryMining(path_to_repo,
+                                  from_tag=from_tag,
+                                  to_tag=to_tag,
+                                  from_commit=from_com,
+                                  to_commit=to_com,
+                                  only_commits=commits
+                                  ).traverse_commits():
+
+            # indexed by position for now, the shards are merged in the same list of commits
+            commit = create_commit(c, positions[c.hash])
+
+            for mod_pos, mod in enumerate(get_modifications(c, is_mined_file, parse_cache)):
+                if mod.old_path not in paths and mod.new_path not in paths:
+                    continue
+                if mod.new_path is not None and mod.new_path not in files:
+                    # keep the position where the file is added to the dict, to merge the shards in the same order
+                    file_positions[mod.new_path] = (positions[c.hash], mod_pos)
+                trashed = len(commit_deleted_methods.get(commit, []))
+                process_modification(mod, commit)
+                # the removed methods too, to be merged in the order of the modifications of the commit
+                for methods in commit_deleted_methods.get(commit, [])[trashed:]:
+                    shard_trash.append(((positions[c.hash], mod_pos), commit, methods))
+
+    shard_files = [(file_positions[path], path, c_file) for path, c_file in files.items()]
+    return shard_files, shard_trash, list(mined_commits)
+
+
+def merge_shards(results):
+    commits = {}
+    for _, _, shard_commits in results:
+        for commit in shard_commits:
+            commits.setdefault(commit.index, commit)
+    new_index = {}
+    for position in sorted(commits):
+        new_index[position] = len(mined_commits)
+        mined_commits.append(commits[position])
+
+    # the changes of the shards refer to the commits by position; refer them by index in mined_commits
+    for shard_files, shard_trash, _ in results:
+        shard_methods = [m for _, _, c_file in shard_files for m in c_file.methods]
+        shard_methods += [m for _, _, methods in shard_trash for m in methods]
+        for m in shard_methods:
+            m.changes[0::2] = array('i', [new_index[i] for i in m.changes[0::2]])
+
+    all_files = [f for shard_files, _, _ in results for f in shard_files]
+    for _, path, c_file in sorted(all_files, key=lambda f: f[0]):
+        files[path] = c_file
+
+    all_trash = [t for _, shard_trash, _ in results for t in shard_trash]
+    for (position, _), _, methods in sorted(all_trash, key=lambda t: t[0]):
+        add_to_trash(methods, commits[position])
+
+    for position, commit in commits.items():
+        commit.index = new_index[position]
+
+
+def mine_parallel(repository: str, processes: int = None, from_tag: str = None, to_tag: str = None,
+                  from_com: str = None, to_com: str = None):
+    """Same result as mine, but the files (grouped by renames) are mined in parallel"""
+    if store is not None:
+        raise ValueError('The parallel mining keeps the state in memory, it can not be used with a store')
+    if detect_moves:
+        raise ValueError('The parallel mining mines the files apart, the moved methods can not be found')
+    processes = processes or os.cpu_count()
+
+    with local_repository(repository, repository_cache) as path_to_repo:
+        hashes = [c.hash for c in RepositoryMining(path_to_repo,
+                                                   from_tag=from_tag,
+                                                   to_tag=to_tag,
+                                                   from_commit=from_com,
+                                                   to_commit=to_com
+                                                   ).traverse_commits()]
+        positions = {h: i for i, h in enumerate(hashes)}
+        c_count, shards = get_file_shards(path_to_repo, hashes, processes)
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(mine_shard, path_to_repo, paths, commits,
+                                       {h: positions[h] for h in commits},
+                                       from_tag, to_tag, from_com, to_com)
+                       for paths, commits in shards]
+            results = [f.result() for f in futures]
+
+    merge_shards(results)
 
-    mine(repo)
-    write_to_csv(files, save_location + '/commits.csv')
+    print("commits parsed: ", c_count)
 
-    print("--- %s seconds ---" % (time.time() - start_time))
 
+def save_changes(file_path: str, include_prev_name: bool = False):
+    """Writes the changes of the methods (see utils.helpers.write_to_csv)"""
+    write_to_csv(files, file_path, include_prev_name, mined_commits if ownership_metrics else None, recent_days)
 
-def mine_before_and_after_tag(repo: str, save_location: str, tag: str = None, commit_hash: str = None):
-    print('========================== mine to tag/commit ==========================')
-    start_time = time.time()
 
-    file_ext = tag if tag is not None else commit_hash[:5]
+def save_stats(file_path_prefix: str, top: int = 10):
+    """Saves the instrumentation of the mining as json and csv, and prints the slowest commits"""
+    stats.write_json(file_path_prefix + '.json')
+    stats.write_csv(file_path_prefix + '.csv')
+    stats.print_report(top)
 
-    if tag is not None:
-        mine(repo, to_tag=tag)
-    elif commit_hash is not None:
-        mine(repo, to_com=commit_hash)
-    write_to_csv(files, save_location + '/commits-to-' + file_ext + '.csv')
 
-    print("--- %s seconds ---" % (time.time() - start_time))
+def mine_and_save_output(repo: str, save_location: str, checkpoint: str = None, history: bool = False,
+                         instrument: bool = False, store_path: str = None, workers: int = None,
+                         parse_cache_path: str = None):
+    print('========================== mine ==========================')
+    start_time = time.time()
+    stats.reset(instrument)
+    if store_path is not None:
+        use_store(store_path)
+    if parse_cache_path is not None:
+        use_parse_cache(parse_cache_path)
+
+    mine(repo, checkpoint=checkpoint, workers=workers)
+    with stats.phase('csv write'):
+        save_changes(save_location + '/commits.csv')
+    if history:
+        write_history(files, mined_commits, save_location + '/history.parquet')
 
-    # remove the commits from the methods and save their current long name in the previous_name field
-    reset_changed_methods_and_save_name()
+    print("--- %s seconds ---" % (time.time() - start_time))
+    if instrument:
+        save_stats(save_location + '/mining-stats')
 
-    write_to_cvs_trash(commit_deleted_methods, save_location + '/removed-to-' + file_ext + '.csv')
-    # clear the list of removed
-    commit_deleted_methods.clear()
 
-    print('========================== mine from tag/commit ==========================')
+def mine_parallel_and_save_output(repo: str, save_location: str, processes: int = None, history: bool = False):
+    print('========================== mine in parallel ==========================')
     start_time = time.time()
 
-    if tag is not None:
-        mine(repo, from_tag=tag)
-    elif commit_hash is not None:
-        mine(repo, from_com=commit_hash)
-    write_to_csv(files, save_location + '/commits-from-' + file_ext + '.csv', include_prev_name=True)
+    mine_parallel(repo, processes)
+    save_changes(save_location + '/commits.csv')
+    if history:
+        write_history(files, mined_commits, save_location + '/history.parquet')
 
     print("--- %s seconds ---" % (time.time() - start_time))
 
-    write_to_cvs_trash(commit_deleted_methods, save_location + '/removed-from-' + file_ext + '.csv')
+
+def mine_before_and_after_tag(repo: str, save_location: str, tag: str = None, commit_hash: str = None,
+                              history: bool = False, instrument: bool = False):
+    """Mines the commits up to the tag/commit (included) and from it, saving the changes of each part.
+
+    The repository is cloned once. The tag/commit is part of both ranges and is mined in each: its diff is read
+    again, the lizard analyses of its sources come from the parse cache. With history, the changes of each part
+    are also saved per commit (see utils.history).
+    """
+    file_ext = tag if tag is not None else commit_hash[:5]
+
+    with local_repository(repo, repository_cache) as path_to_repo:
+        git_repo = GitRepository(path_to_repo)
+        boundary = git_repo.get_commit_from_tag(tag) if tag is not None else git_repo.get_commit(commit_hash)
+
+        print('========================== mine to tag/commit ==========================')
+        start_time = time.time()
+        stats.reset(instrument)
+
+        mine_commits(RepositoryMining(path_to_repo, to_commit=boundary.hash).traverse_commits())
+        with stats.phase('csv write'):
+            save_changes(save_location + '/commits-to-' + file_ext + '.csv')
+        if history:
+            write_history(files, mined_commits, save_location + '/history-to-' + file_ext + '.parquet')
+
+        print("--- %s seconds ---" % (time.time() - start_time))
+        if instrument:
+            save_stats(save_location + '/mining-stats-to-' + file_ext)
+
+        # remove the commits from the methods and save their current long name in the previous_name field
+        reset_changed_methods_and_save_name()
+
+        write_to_cvs_trash(commit_deleted_methods, save_location + '/removed-to-' + file_ext + '.csv')
+        # clear the list of removed
+        commit_deleted_methods.clear()
+
+        print('========================== mine from tag/commit ==========================')
+        start_time = time.time()
+        stats.reset(instrument)
+
+        mine_commits(RepositoryMining(path_to_repo, from_commit=boundary.hash).traverse_commits())
+        with stats.phase('csv write'):
+            save_changes(save_location + '/commits-from-' + file_ext + '.csv', include_prev_name=True)
+        if history:
+            write_history(files, mined_commits, save_location + '/history-from-' + file_ext + '.parquet')
+
+        print("--- %s seconds ---" % (time.time() - start_time))
+        if instrument:
+            save_stats(save_location + '/mining-stats-from-' + file_ext)
+
+        write_to_cvs_trash(commit_deleted_methods, save_location + '/removed-from-' + file_ext + '.csv')
+
+
+def commits_of_snapshot(commits: Iterator[PyDrillerCommit], snapshot: set, later: list):
+    """Yields the commits of the snapshot (hashes) in the order of the history: first those kept in later, then
+    the next ones of commits. The commits of the next snapshots met before the end are kept in later."""
+    remaining = set(snapshot)
+    earlier = [c for c in later if c.hash in remaining]
+    later[:] = [c for c in later if c.hash not in remaining]
+    for c in earlier:
+        remaining.discard(c.hash)
+        yield c
+    while remaining:
+        c = next(commits, None)
+        if c is None:
+            return
+        if c.hash in remaining:
+            remaining.discard(c.hash)
+            yield c
+        else:
+            later.append(c)
+
+
+def mine_snapshots(repo: str, save_location: str, tags: List[str] = None, commit_hashes: List[str] = None,
+                   cumulative: bool = True, history: bool = False):
+    """Mines the history once and saves the changes and the removed methods at each tag/commit.
+
+    With cumulative, each snapshot has the changes of the ancestors of the tag/commit (as the commits-to files
+    of mine_before_and_after_tag); otherwise it has those of the ancestors not in the previous snapshot, with
+    the previous names of the methods. The tags/commits have to be on one line of the history (each one an
+    ancestor of the next). The files are named by the tag, or by the first characters of the commit hash.
+    """
+    with local_repository(repo, repository_cache) as path_to_repo:
+        git_repo = GitRepository(path_to_repo)
+        boundaries = {}
+        for tag in tags or []:
+            boundaries[git_repo.get_commit_from_tag(tag).hash] = tag
+        for commit_hash in commit_hashes or []:
+            boundaries[git_repo.get_commit(commit_hash).hash] = commit_hash[:5]
+        if not boundaries:
+            return
+
+        # a commit merged from a side branch after a tag is not in the snapshot of the tag, even if it is older
+        order = sorted(boundaries, key=lambda h: int(git_repo.repo.git.rev_list('--count', h)))
+        for previous_hash, boundary in zip(order, order[1:]):
+            if not git_repo.repo.is_ancestor(previous_hash, boundary):
+                raise ValueError('{} is not an ancestor of {}, the snapshots have to be on one line of the history'
+                                 .format(boundaries[previous_hash], boundaries[boundary]))
+
+        print('========================== mine snapshots ==========================')
+        start_time = time.time()
+        commits = iter(RepositoryMining(path_to_repo, to_commit=order[-1]).traverse_commits())
+        later = []
+        previous = None
+        for i, boundary in enumerate(order):
+            revisions = [boundary] + (['^' + order[i - 1]] if i > 0 else [])
+            snapshot = set(git_repo.repo.git.rev_list(*revisions).split())
+            mine_commits(commits_of_snapshot(commits, snapshot, later))
+            name = boundaries[boundary]
+
+            file_ext = 'to-' + name if cumulative or previous is None else previous + '-to-' + name
+            save_changes(save_location + '/commits-' + file_ext + '.csv',
+                         include_prev_name=not cumulative and previous is not None)
+            write_to_cvs_trash(commit_deleted_methods, save_location + '/removed-' + file_ext + '.csv')
+            if history:
+                write_history(files, mined_commits, save_location + '/history-' + file_ext + '.parquet')
+            print('snapshot {} --- {} seconds ---'.format(name, time.time() - start_time))
+
+            if not cumulative:
+                reset_changed_methods_and_save_name()
+                commit_deleted_methods.clear()
+            previous = name
 
 
 if __name__ == '__main__':
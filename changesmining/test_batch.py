@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from batch import get_repository_name, mine_repositories
+from utils.synthetic import SyntheticRepository
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_repository_name(self):
+        self.assertEqual('ShareX', get_repository_name({'repository': 'https://github.com/ShareX/ShareX.git'}))
+        self.assertEqual('repo', get_repository_name({'repository': '/tmp/repo/'}))
+        self.assertEqual('other', get_repository_name({'name': 'other', 'repository': '/tmp/repo'}))
+
+    def test_mine_repositories(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            repo = SyntheticRepository(os.path.join(tmp_folder, 'repo'), nr_commits=10, nr_files=3).generate()
+            manifest = [{'repository': os.path.join(tmp_folder, 'missing')}, {'repository': repo}]
+
+            results = mine_repositories(manifest, os.path.join(tmp_folder, 'output'), processes=2)
+
+            self.assertEqual([('missing', 'failed', 0), ('repo', 'ok', 10)],
+                             [(r['Name'], r['Status'], r['Commits']) for r in results])
+            self.assertTrue(os.path.exists(os.path.join(tmp_folder, 'output', 'repo', 'commits.csv')))
+            self.assertTrue(os.path.exists(os.path.join(tmp_folder, 'output', 'missing', 'mining.log')))
+
+            with self.assertRaises(ValueError):
+                mine_repositories(manifest + [{'repository': repo + '/'}], os.path.join(tmp_folder, 'output'))
+
+    def test_options_and_shared_mirror(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            repo = SyntheticRepository(os.path.join(tmp_folder, 'repo'), nr_commits=10, nr_files=3).generate()
+            url = 'file://' + repo
+            manifest = [{'name': 'owned', 'repository': url, 'ownership_metrics': True},
+                        {'name': 'default', 'repository': url}]
+
+            results = mine_repositories(manifest, os.path.join(tmp_folder, 'output'), processes=1,
+                                        repository_cache=os.path.join(tmp_folder, 'cache'))
+
+            self.assertEqual([('owned', 'ok', 10), ('default', 'ok', 10)],
+                             [(r['Name'], r['Status'], r['Commits']) for r in results])
+            self.assertEqual(1, len(os.listdir(os.path.join(tmp_folder, 'cache'))))
+            headers = []
+            for name in ['owned', 'default']:
+                with open(os.path.join(tmp_folder, 'output', name, 'commits.csv')) as f:
+                    headers.append(f.readline())
+            # the option of the first repository is not kept for the second one
+            self.assertIn('Authors', headers[0])
+            self.assertNotIn('Authors', headers[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+from git import Repo
+
+from benchmark import check_thresholds, get_thresholds
+from utils.synthetic import SyntheticRepository
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_generated_repository(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            path = SyntheticRepository(os.path.join(tmp_folder, 'repo'), nr_commits=5, nr_files=3,
+                                       rename_share=0.5, refactor_share=0.5).generate()
+            repo = Repo(path)
+
+            self.assertEqual(5, len(list(repo.iter_commits())))
+            self.assertEqual(3, len([b for b in repo.commit('HEAD~4').tree.traverse() if b.type == 'blob']))
+            self.assertEqual(['commit 0', 'commit 4'], [repo.commit('HEAD~4').summary, repo.head.commit.summary])
+
+    def test_files_added_and_changed_in_the_same_commit(self):
+        # small repositories with many renames: some files are renamed or removed by the commit adding them
+        for seed in range(1, 21):
+            nr_commits = 20 + 2 * seed
+            with tempfile.TemporaryDirectory() as tmp_folder:
+                synthetic = SyntheticRepository(os.path.join(tmp_folder, 'repo'), nr_commits=nr_commits, nr_files=3,
+                                                methods_per_file=3, rename_share=0.3, move_share=0.1, seed=seed)
+                repo = Repo(synthetic.generate())
+
+                self.assertEqual(nr_commits, len(list(repo.iter_commits())))
+                self.assertEqual(sorted(synthetic.files),
+                                 sorted(b.path for b in repo.head.commit.tree.traverse() if b.type == 'blob'))
+
+    def test_regressions(self):
+        previous = {'edits': {'thresholds': get_thresholds({'commits_per_sec': 100, 'peak_memory_mb': 50,
+                                                            'similarity_seconds': 1, 'changed_lines_seconds': 1},
+                                                           tolerance=0.2)}}
+        result = {'commits_per_sec': 70, 'peak_memory_mb': 55, 'similarity_seconds': 1, 'changed_lines_seconds': 1.5}
+
+        failures = check_thresholds({'edits': result}, previous)
+
+        self.assertEqual(2, len(failures))
+        self.assertTrue(failures[0].startswith('edits: commits_per_sec'))
+
+
+if __name__ == '__main__':
+    unittest.main()
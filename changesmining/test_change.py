@@ -0,0 +1,88 @@
+import random
+import unittest
+from types import SimpleNamespace
+
+import main
+from utils.change import ChangedFile, ChangedMethod, MethodsSplit
+
+
+class MyTestCase(unittest.TestCase):
+
+    names = ['Load()', 'Load( string path)', 'Save( string path)', 'Save( string path, bool b)', 'Clear()']
+    class_paths = ['Ns::A::', 'Ns::B::', 'Other::A::']
+
+    def assert_indexes(self, c_file: ChangedFile):
+        """The indexes give the same methods, in the same order, as a scan of all the methods"""
+        for m in c_file.methods:
+            long_name = m.class_path + m.name
+            self.assertEqual([x for x in c_file.methods
+                              if (x.class_path + x.name).replace(' ', '') == long_name.replace(' ', '')],
+                             c_file.find_by_long_name(long_name.replace(' ', '')))
+            self.assertEqual([x for x in c_file.methods if x.name[:x.name.rfind('(')] == m.name[:m.name.rfind('(')]],
+                             c_file.find_by_name(m.name))
+            self.assertTrue(c_file.has_long_name(long_name))
+        self.assertEqual([], c_file.find_by_long_name('Ns::Missing::Load()'))
+        self.assertEqual([], c_file.find_by_name('Missing()'))
+
+    def test_indexes_after_changes(self):
+        rng = random.Random(1)
+        main.reset_state()
+        c_file = main.search_modified_file_or_create('A.cs', 'src/A.cs')
+        for step in range(500):
+            op = rng.random()
+            methods = c_file.methods
+            if op < 0.3 or not methods:
+                c_file.add_method(ChangedMethod(rng.choice(self.names), rng.choice(self.class_paths)))
+            elif op < 0.45:
+                c_file.rename_method(rng.choice(methods), rng.choice(self.names), rng.choice(self.class_paths))
+            elif op < 0.6:
+                removed = rng.sample(methods, rng.randint(1, min(3, len(methods))))
+                self.assertEqual([m for m in methods if m in removed], c_file.remove_methods(removed))
+            elif op < 0.7:
+                main.update_methods_with_new_class(c_file, [m.class_path + m.name for m in methods],
+                                                   rng.choice(self.class_paths), rng.choice(self.class_paths))
+            elif op < 0.8:
+                main.update_method_with_new_class(c_file, rng.choice(self.names), rng.choice(self.class_paths),
+                                                  rng.choice(self.class_paths))
+            elif op < 0.9:
+                main.update_all_methods_with_new_class(c_file, rng.choice(self.class_paths),
+                                                       rng.choice(self.class_paths))
+            else:
+                # the file is renamed: the same object, with its methods and indexes
+                path = 'src/{}.cs'.format(step)
+                self.assertIs(c_file, main.update_modified_file(path[4:], c_file.full_path, path))
+                self.assertEqual(path, c_file.full_path)
+            self.assert_indexes(c_file)
+        self.assertEqual([c_file], list(main.files.values()))
+        main.reset_state()
+
+    def test_methods_split_with_duplicate_long_names(self):
+        names = ['A::Load()', 'A::Load()', 'A::Keep()', 'A::Save()']
+        before = [SimpleNamespace(long_name=n) for n in names + ['A::Old()']]
+        current = [SimpleNamespace(long_name=n) for n in names + ['A::New()']]
+        # as a set, not in the order of the file; the second Load is changed in current, the first one in before
+        changed = [before[3], current[4], before[0], current[1], before[4]]
+        methods = MethodsSplit(SimpleNamespace(methods_before=before, methods=current, changed_methods=changed))
+
+        self.assertEqual([current[1], current[4], before[0], before[3], before[4]], methods.changed)
+        self.assertEqual([before[4]], methods.obsolete)
+        self.assertEqual([current[4]], methods.new)
+        self.assertEqual([current[1], before[0], before[3]], methods.updated)
+        self.assertEqual(['A::Old()'], methods.names_obsolete)
+        self.assertEqual(['A::New()'], methods.names_new)
+        self.assertEqual(['A::Load()', 'A::Load()', 'A::Save()'], methods.names_updated)
+        self.assertEqual(['A::Load()', 'A::Load()', 'A::Keep()', 'A::Save()'], methods.names_before_without_obsolete)
+        self.assertEqual(['A::Load()', 'A::Load()', 'A::Keep()', 'A::Save()'], methods.names_current_without_new)
+        # the first method with each long name
+        self.assertIs(before[0], methods.before_by_long_name['A::Load()'])
+        self.assertIs(current[0], methods.current_by_long_name['A::Load()'])
+        self.assertEqual(['A::Load()', 'A::Keep()', 'A::Save()', 'A::New()'], list(methods.current_by_long_name))
+        self.assertTrue(methods.exist_new() and methods.exist_obsolete() and methods.exist_updated())
+
+        methods = MethodsSplit(SimpleNamespace(methods_before=before, methods=current, changed_methods=[current[0]]))
+        self.assertEqual([current[0]], methods.updated)
+        self.assertFalse(methods.exist_new() or methods.exist_obsolete())
+
+
+if __name__ == '__main__':
+    unittest.main()
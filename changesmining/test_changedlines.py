@@ -0,0 +1,47 @@
+import random
+import unittest
+
+from utils.changedlines import count_with_differ, count_with_opcodes
+
+
+class MyTestCase(unittest.TestCase):
+
+    lines = ['{', '}', '', '// comment', 'return;', 'break;', 'i++;', 'var a = b;', 'Foo(bar);', 'if (x)',
+             'else', 'return x;']
+
+    def random_method(self, rng, n):
+        return [rng.choice(self.lines) if rng.random() < 0.5 else 'Call{}({});'.format(rng.randint(0, 30), i)
+                for i in range(n)]
+
+    def change_method(self, rng, method):
+        changed = list(method)
+        for _ in range(rng.randint(0, len(method) // 3 + 1)):
+            i = rng.randint(0, len(changed))
+            op = rng.random()
+            if op < 0.3 and changed:
+                changed.pop(min(i, len(changed) - 1))
+            elif op < 0.6:
+                changed.insert(i, rng.choice(self.lines))
+            elif changed:
+                changed[min(i, len(changed) - 1)] += ' // changed'
+        return changed
+
+    def test_comments_and_braces_not_counted(self):
+        before = ['{', '// old comment', 'a = 1;', '', 'b = 2;', '}']
+        current = ['{', '// new comment', 'a = 3;', 'b = 2;', '}']
+
+        self.assertEqual(1, count_with_differ(before, current))
+        self.assertEqual(1, count_with_opcodes(before, current))
+
+    def test_opcodes_same_as_differ(self):
+        rng = random.Random(1)
+        # methods with at least 200 lines have popular lines, for which the replaced blocks are compared again
+        for n in [0, 1, 5, 20, 60, 250]:
+            for _ in range(30):
+                before = self.random_method(rng, n)
+                current = self.change_method(rng, before) if rng.random() < 0.8 else self.random_method(rng, n)
+                self.assertEqual(count_with_differ(before, current), count_with_opcodes(before, current))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import filecmp
+import gzip
+import os
+import pickle
+import subprocess
+import tempfile
+import unittest
+
+import main
+from utils.helpers import CHECKPOINT_VERSION, load_checkpoint, save_checkpoint
+from utils.synthetic import SyntheticRepository
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_resume_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            repo = SyntheticRepository(os.path.join(tmp_folder, 'repo'), nr_commits=30, nr_files=4).generate()
+            subprocess.run(['git', 'tag', 'v1', 'HEAD~12'], cwd=repo, check=True)
+            checkpoint = os.path.join(tmp_folder, 'state.ckpt')
+            for folder in ['resumed', 'full']:
+                os.makedirs(os.path.join(tmp_folder, folder))
+
+            main.reset_state()
+            main.mine(repo, to_tag='v1', checkpoint=checkpoint)
+            self.assertEqual(18, len(main.mined_commits))
+            main.reset_state()
+            main.mine(repo, checkpoint=checkpoint)
+            self.assertEqual(30, len(main.mined_commits))
+            main.write_to_csv(main.files, os.path.join(tmp_folder, 'resumed', 'commits.csv'))
+            main.write_to_cvs_trash(main.commit_deleted_methods, os.path.join(tmp_folder, 'resumed', 'removed.csv'))
+            main.reset_state()
+            main.mine(repo)
+            main.write_to_csv(main.files, os.path.join(tmp_folder, 'full', 'commits.csv'))
+            main.write_to_cvs_trash(main.commit_deleted_methods, os.path.join(tmp_folder, 'full', 'removed.csv'))
+            main.reset_state()
+
+            for file_name in ['commits.csv', 'removed.csv']:
+                self.assertTrue(filecmp.cmp(os.path.join(tmp_folder, 'resumed', file_name),
+                                            os.path.join(tmp_folder, 'full', file_name), shallow=False), file_name)
+
+    def test_checkpoint_version(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            checkpoint = os.path.join(tmp_folder, 'state.ckpt')
+            save_checkpoint({'A.cs': None}, {}, [], 'abc', checkpoint)
+            self.assertEqual(({'A.cs': None}, {}, [], 'abc'), load_checkpoint(checkpoint))
+
+            # a checkpoint of another version of the state is not loaded
+            with gzip.open(checkpoint, 'wb') as f:
+                pickle.dump({'version': CHECKPOINT_VERSION - 1, 'last_commit': 'abc', 'files': {},
+                             'commit_deleted_methods': {}, 'mined_commits': []}, f)
+            with self.assertRaises(ValueError):
+                load_checkpoint(checkpoint)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+
+from utils.filetypes import get_file_types, is_file_type
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_file_types_of_languages(self):
+        self.assertEqual(('.cs',), get_file_types(['csharp']))
+        self.assertEqual(('.cs', '.java'), tuple(sorted(get_file_types(['Java', 'csharp']))))
+
+    def test_unknown_language(self):
+        with self.assertRaises(ValueError):
+            get_file_types(['csharp', 'cobol'])
+
+    def test_is_file_type(self):
+        self.assertTrue(is_file_type('Form.Designer.cs', ('.cs',)))
+        self.assertFalse(is_file_type('README.md', ('.cs', '.java')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from pydriller.domain.developer import Developer
+
+from utils.change import ChangedFile, ChangedMethod, Commit
+from utils.helpers import write_to_csv
+from utils.history import history_to_csv, iter_history_rows, write_history
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.commits = [Commit(i, datetime(2020, 1, i + 1, tzinfo=timezone.utc), Developer('dev', 'dev@mail'),
+                               'msg', 'hash{}'.format(i)) for i in range(3)]
+        c_file = ChangedFile('A.cs', 'src/A.cs')
+        load = ChangedMethod('Load()', 'Ns::A::')
+        load.add_change(self.commits[0])
+        load.add_change(self.commits[2], 4)
+        # two methods with the same name are kept apart
+        same = ChangedMethod('Load()', 'Ns::A::')
+        same.add_change(self.commits[1], 2)
+        unchanged = ChangedMethod('Save()', 'Ns::A::')
+        for m in [load, same, unchanged]:
+            c_file.add_method(m)
+        self.files = {'src/A.cs': c_file}
+
+    def test_history_rows(self):
+        rows = list(iter_history_rows(self.files, self.commits))
+
+        self.assertEqual([(0, 'hash0', 0), (0, 'hash2', 4), (1, 'hash1', 2), (2, None, 0)],
+                         [(row[0], row[5], row[8]) for row in rows])
+
+    @unittest.skipIf(importlib.util.find_spec('pyarrow') is None, 'pyarrow is not installed')
+    def test_csv_derived_from_history(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            history_path = os.path.join(tmp_folder, 'history.parquet')
+            write_history(self.files, self.commits, history_path, row_group_size=2)
+            write_to_csv(self.files, os.path.join(tmp_folder, 'commits.csv'), include_prev_name=True)
+            history_to_csv(history_path, os.path.join(tmp_folder, 'derived.csv'), include_prev_name=True)
+
+            with open(os.path.join(tmp_folder, 'commits.csv')) as expected, \
+                    open(os.path.join(tmp_folder, 'derived.csv')) as derived:
+                self.assertEqual(expected.read(), derived.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
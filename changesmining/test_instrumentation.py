@@ -0,0 +1,34 @@
+import unittest
+
+from utils.instrumentation import MiningStats
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_disabled_records_nothing(self):
+        stats = MiningStats()
+        stats.start_commit('hash0')
+        with stats.phase('similarity'):
+            stats.count('similarity comparisons', 4)
+        stats.end_commit()
+
+        self.assertEqual([], stats.commits)
+        self.assertEqual(0, stats.counters['similarity comparisons'])
+
+    def test_commits_by_time(self):
+        stats = MiningStats(enabled=True)
+        for h, comparisons in [('hash0', 1), ('hash1', 100000)]:
+            stats.start_commit(h)
+            with stats.phase('changed lines'):
+                for i in range(comparisons):
+                    stats.count('changed lines comparisons')
+            stats.end_commit()
+
+        self.assertEqual(['hash1', 'hash0'], [c['hash'] for c in stats.slowest_commits()])
+        self.assertEqual(100001, stats.counters['changed lines comparisons'])
+        self.assertEqual(1, stats.commits[0]['counters']['changed lines comparisons'])
+        self.assertGreater(stats.commits[1]['phases']['changed lines'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
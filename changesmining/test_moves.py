@@ -0,0 +1,115 @@
+import csv
+import os
+import subprocess
+import tempfile
+import unittest
+
+import main
+from utils.moves import MoveIndex
+
+body = ['{', 'var a = Read(path);', '// comment', 'var b = Parse(a);', 'Check(b, a);', 'return b;', '}']
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_same_body(self):
+        index = MoveIndex()
+        index.add('removed', body, 'A.cs')
+
+        self.assertIsNone(index.pop_match(body, 'A.cs'))
+        # the comments and empty lines are ignored
+        self.assertEqual(('removed', body), index.pop_match([line for line in body if line != '// comment'] + [''],
+                                                            'B.cs'))
+        self.assertIsNone(index.pop_match(body, 'B.cs'))
+
+    def test_similar_body(self):
+        index = MoveIndex()
+        index.add('other', ['{', 'Write(x);', 'Write(y);', 'Write(z);', '}'], 'A.cs')
+        index.add('removed', body, 'A.cs')
+
+        changed = body[:-1] + ['Log(b);', '}']
+        self.assertEqual('removed', index.pop_match(changed, 'B.cs')[0])
+        self.assertIsNone(index.pop_match(['{', 'Write(a);', 'Write(b);', 'Write(c);', '}'], 'B.cs'))
+
+    def test_small_body(self):
+        index = MoveIndex()
+        index.add('removed', ['{', 'return a;', '}'], 'A.cs')
+
+        self.assertIsNone(index.pop_match(['{', 'return a;', '}'], 'B.cs'))
+
+
+def write_class(repo, file_name, class_name, methods):
+    lines = ['namespace Ns', '{', '    class ' + class_name, '    {']
+    for name, method_body in methods:
+        lines += ['        public int {}(string path)'.format(name), '        {']
+        lines += ['            ' + line for line in method_body] + ['            return 0;', '        }']
+    with open(os.path.join(repo, file_name), 'w') as f:
+        f.write('\n'.join(lines + ['    }', '}', '']))
+
+
+def commit_all(repo, message):
+    subprocess.run(['git', 'add', '-A'], cwd=repo, check=True)
+    subprocess.run(['git', 'commit', '-q', '-m', message], cwd=repo, check=True)
+
+
+def read_rows(file_path):
+    with open(file_path) as f:
+        return {row['Method']: row for row in csv.DictReader(f, delimiter=';')}
+
+
+class MinedMovesTestCase(unittest.TestCase):
+
+    def test_moved_methods_keep_their_history(self):
+        load = ['var a = Read(path);', 'var b = Parse(a);', 'Check(b, a);']
+        helper = ['var x = Open(path);', 'var y = Decode(x);', 'Store(y, x);']
+        keep = ['Log(path);']
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            repo = os.path.join(tmp_folder, 'repo')
+            os.makedirs(repo)
+            subprocess.run(['git', 'init', '-q'], cwd=repo, check=True)
+            subprocess.run(['git', 'config', 'user.name', 'test'], cwd=repo, check=True)
+            subprocess.run(['git', 'config', 'user.email', 'test@example.com'], cwd=repo, check=True)
+            write_class(repo, 'A.cs', 'A', [('Load', load), ('Keep', keep)])
+            write_class(repo, 'B.cs', 'B', [('Other', keep)])
+            write_class(repo, 'C.cs', 'C', [('Helper', helper)])
+            commit_all(repo, 'add')
+            load[1] = 'var b = ParseAll(a);'
+            write_class(repo, 'A.cs', 'A', [('Load', load), ('Keep', keep)])
+            commit_all(repo, 'edit Load')
+            subprocess.run(['git', 'tag', 'v1'], cwd=repo, check=True)
+            # Load is moved to B.cs with a changed line, Helper is moved from the deleted C.cs
+            write_class(repo, 'A.cs', 'A', [('Keep', keep)])
+            write_class(repo, 'B.cs', 'B', [('Other', keep), ('Load', load + ['Log(b);']), ('Helper', helper)])
+            os.remove(os.path.join(repo, 'C.cs'))
+            commit_all(repo, 'move Load and Helper')
+            out = os.path.join(tmp_folder, 'out')
+            os.makedirs(out)
+
+            main.reset_state()
+            main.detect_moves = True
+            main.mine(repo)
+            main.save_changes(os.path.join(out, 'commits.csv'))
+            main.write_to_cvs_trash(main.commit_deleted_methods, os.path.join(out, 'removed.csv'))
+            main.reset_state()
+            main.detect_moves = True
+            main.mine_before_and_after_tag(repo, out, tag='v1')
+            main.reset_state()
+
+            changes = read_rows(os.path.join(out, 'commits.csv'))
+            self.assertEqual(['Ns::A::Keep( string path)', 'Ns::B::Other( string path)', 'Ns::B::Load( string path)',
+                              'Ns::B::Helper( string path)'], list(changes))
+            # added, edited (1 line) and moved (Log(b) is added: no line of the removed method is changed)
+            self.assertEqual(('3', '1'), (changes['Ns::B::Load( string path)']['Changes'],
+                                          changes['Ns::B::Load( string path)']['ChgLines']))
+            self.assertEqual(('2', '0'), (changes['Ns::B::Helper( string path)']['Changes'],
+                                          changes['Ns::B::Helper( string path)']['ChgLines']))
+            self.assertEqual({}, read_rows(os.path.join(out, 'removed.csv')))
+
+            # the history after the tag continues the one of the removed method, with its previous name
+            moved = read_rows(os.path.join(out, 'commits-from-v1.csv'))['Ns::B::Load( string path)']
+            self.assertEqual(('2', 'Ns::A::Load( string path)'), (moved['Changes'], moved['Previous_name']))
+            self.assertEqual({}, read_rows(os.path.join(out, 'removed-from-v1.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
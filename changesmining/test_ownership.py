@@ -0,0 +1,30 @@
+import unittest
+from datetime import datetime, timezone
+
+from pydriller.domain.developer import Developer
+
+from utils.change import ChangedMethod, Commit
+from utils.ownership import CommitAttributes, get_ownership_metrics
+
+
+def create_commit(index, day, name, email):
+    return Commit(index, datetime(2020, 5, day, tzinfo=timezone.utc), Developer(name, email), '', str(index))
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_ownership_metrics(self):
+        commits = [create_commit(0, 1, 'Ann', 'ann@mail'), create_commit(1, 10, 'Bob', 'bob@mail'),
+                   create_commit(2, 20, 'ann', 'Ann@Mail'), create_commit(3, 30, 'Bob', 'bob@mail')]
+        attributes = CommitAttributes(commits)
+        m = ChangedMethod('Get()', 'Ns::A::')
+        for c, changed_lines in [(commits[0], 0), (commits[1], 5), (commits[2], 3)]:
+            m.add_change(c, changed_lines)
+
+        self.assertEqual([2, commits[2].date, 10, 8], get_ownership_metrics(m, attributes, recent_days=20))
+        self.assertEqual([2, commits[2].date, 10, 3], get_ownership_metrics(m, attributes, recent_days=15))
+        self.assertEqual([0, '', '', 0], get_ownership_metrics(ChangedMethod('Set()', 'Ns::A::'), attributes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import filecmp
+import os
+import tempfile
+import unittest
+
+import main
+from utils.synthetic import SyntheticRepository
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_parallel_same_as_serial(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            # moves remove methods from several files (of different shards) in the same commit
+            repo = SyntheticRepository(os.path.join(tmp_folder, 'repo'), nr_commits=60, nr_files=8,
+                                       rename_share=0.2, move_share=0.2).generate()
+            for folder in ['serial', 'parallel']:
+                os.makedirs(os.path.join(tmp_folder, folder))
+
+            main.reset_state()
+            main.mine(repo)
+            main.write_to_csv(main.files, os.path.join(tmp_folder, 'serial', 'commits.csv'))
+            main.write_to_cvs_trash(main.commit_deleted_methods, os.path.join(tmp_folder, 'serial', 'removed.csv'))
+            main.reset_state()
+            main.mine_parallel(repo, processes=3)
+            main.write_to_csv(main.files, os.path.join(tmp_folder, 'parallel', 'commits.csv'))
+            main.write_to_cvs_trash(main.commit_deleted_methods, os.path.join(tmp_folder, 'parallel', 'removed.csv'))
+            main.reset_state()
+
+            for file_name in ['commits.csv', 'removed.csv']:
+                self.assertTrue(filecmp.cmp(os.path.join(tmp_folder, 'serial', file_name),
+                                            os.path.join(tmp_folder, 'parallel', file_name), shallow=False),
+                                file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from utils.parsecache import ParseCache
+
+source = '''
+namespace Ns
+{
+    public class A
+    {
+        public int Get(int a)
+        {
+            return a;
+        }
+
+        public void Set(int a, int b)
+        {
+        }
+    }
+}
+'''
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_analyze(self):
+        cache = ParseCache()
+        nloc, _, _, methods = cache.analyze('abc', 'A.cs', source)
+
+        self.assertEqual(['Ns::A::Get( int a)', 'Ns::A::Set( int a , int b)'], [m.long_name for m in methods])
+        self.assertEqual([6, 11], [m.start_line for m in methods])
+        self.assertEqual(nloc, cache.analyze('abc', 'B.cs', source)[0])
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+        # another language
+        cache.analyze('abc', 'A.java', source)
+        self.assertEqual(2, cache.misses)
+
+    def test_eviction(self):
+        cache = ParseCache(max_entries=2)
+        for blob in ['a', 'b', 'a', 'c', 'a', 'b']:
+            cache.analyze(blob, 'A.cs', source)
+
+        self.assertEqual((2, 4), (cache.hits, cache.misses))
+
+    def test_saved(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            path = os.path.join(tmp_folder, 'parse.db')
+            cache = ParseCache(path=path)
+            methods = cache.analyze('abc', 'A.cs', source)[3]
+            cache.close()
+
+            cache = ParseCache(path=path)
+            saved_methods = cache.analyze('abc', 'A.cs', source)[3]
+            cache.close()
+
+            self.assertEqual((1, 0), (cache.hits, cache.misses))
+            self.assertEqual([(m.long_name, m.start_line, m.end_line) for m in methods],
+                             [(m.long_name, m.start_line, m.end_line) for m in saved_methods])
+
+
+if __name__ == '__main__':
+    unittest.main()
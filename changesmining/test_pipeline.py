@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+from pydriller import RepositoryMining
+from pydriller.domain.commit import ModificationType
+
+from utils.filetypes import is_file_type
+from utils.pipeline import iter_parsed_commits
+from utils.repository import get_modifications
+from utils.synthetic import SyntheticRepository
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_parsed_commits(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            path = SyntheticRepository(os.path.join(tmp_folder, 'repo'), nr_commits=12, nr_files=4,
+                                       rename_share=0.3, move_share=0.2).generate()
+            commits = list(RepositoryMining(path).traverse_commits())
+
+            parsed = list(iter_parsed_commits(path, [c.hash for c in commits], ('.cs',), workers=2, prefetch=3))
+
+            self.assertEqual([c.hash for c in commits], [c.hash for c in parsed])
+            for c, p in zip(commits, parsed):
+                self.assertEqual(c.committer_date, p.committer_date)
+                modifications = get_modifications(c, lambda filename: is_file_type(filename, ('.cs',)))
+                self.assertEqual([(m.change_type, m.old_path, m.new_path, m.source_code) for m in modifications],
+                                 [(m.change_type, m.old_path, m.new_path, m.source_code) for m in p.modifications])
+                # the methods of the deleted files are not parsed
+                self.assertEqual([sorted(m.long_name for m in mod.changed_methods) for mod in modifications
+                                  if mod.change_type != ModificationType.DELETE],
+                                 [sorted(m.long_name for m in mod.changed_methods) for mod in p.modifications
+                                  if mod.change_type != ModificationType.DELETE])
+
+
+if __name__ == '__main__':
+    unittest.main()
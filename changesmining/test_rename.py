@@ -0,0 +1,63 @@
+import random
+import unittest
+
+import main
+from utils.change import ChangedFile, ChangedMethod, MethodsSplit
+
+
+class FakeMethod:
+    def __init__(self, long_name):
+        self.long_name = long_name
+
+
+class FakeModification:
+    def __init__(self, diff, methods_before, methods, changed_methods=()):
+        self.diff = diff
+        self.methods_before = [FakeMethod(m) for m in methods_before]
+        self.methods = [FakeMethod(m) for m in methods]
+        self.changed_methods = [m for m in self.methods + self.methods_before if m.long_name in changed_methods]
+
+
+def scan_for_declaration(diff):
+    # the line loop of possible_rename_check before the regular expression
+    for line in diff.splitlines(1):
+        line = line.lower()
+        if line.startswith('-') and (("namespace " in line) or ("class " in line) or ("struct " in line)):
+            return True
+    return False
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_declaration_same_as_line_scan(self):
+        fragments = ['-', '+', ' ', '-    ', 'public ', 'Class ', 'class', 'NAMESPACE ', 'Namespace', 'struct ',
+                     'STRUCT', 'x', 'claſs ', 'Kclass ', '\n', '\r\n', '\r', '\x0b', ' ', '\n-']
+        rng = random.Random(1)
+        for _ in range(5000):
+            diff = ''.join(rng.choice(fragments) for _ in range(rng.randint(0, 12)))
+            self.assertEqual(scan_for_declaration(diff), main.possible_rename_check(FakeModification(diff, [], [])),
+                             repr(diff))
+
+    def test_rename_of_class(self):
+        diff = '@@ -1,3 +1,3 @@\r\n namespace Ns\r\n-    Class A\r\n+    Class B\r\n'
+        mod = FakeModification(diff, ['Ns::A::Load()', 'Ns::A::Save( int a)', 'Ns::C::Load()'],
+                               ['Ns::B::Load()', 'Ns::B::Save( int a)', 'Ns::C::Load()'])
+        c_file = ChangedFile('A.cs', 'src/A.cs')
+        for name, class_path in [('Load()', 'Ns::A::'), ('Save( int a)', 'Ns::A::'), ('Load()', 'Ns::C::')]:
+            c_file.add_method(ChangedMethod(name, class_path))
+
+        self.assertEqual({'Ns::A::': 'Ns::B::'}, main.check_for_rename(mod, c_file, MethodsSplit(mod)))
+        self.assertEqual(['Ns::B::Load()', 'Ns::B::Save( int a)', 'Ns::C::Load()'],
+                         [m.class_path + m.name for m in c_file.methods])
+        # renamed through the file, so its indexes follow
+        self.assertEqual([], c_file.find_by_long_name('Ns::A::Load()'))
+        self.assertEqual([c_file.methods[1]], c_file.find_by_long_name('Ns::B::Save(int a)'))
+        self.assertEqual([c_file.methods[0], c_file.methods[2]], c_file.find_by_name('Load()'))
+
+        # no declaration is removed: the classes are not compared
+        mod.diff = '@@ -1,3 +1,3 @@\n-    Load();\n+    Save();\n'
+        self.assertEqual({}, main.check_for_rename(mod, c_file, MethodsSplit(mod)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from git import Actor, Repo
+
+from utils.repository import local_repository, mirror_path, update_mirror
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_folder = tempfile.TemporaryDirectory()
+        self.origin = Repo.init(os.path.join(self.tmp_folder.name, 'origin'))
+        self.url = 'file://' + self.origin.working_dir
+        self.cache = os.path.join(self.tmp_folder.name, 'cache')
+        self.commit('first')
+
+    def tearDown(self):
+        self.tmp_folder.cleanup()
+
+    def commit(self, msg):
+        with open(os.path.join(self.origin.working_dir, 'A.cs'), 'a') as f:
+            f.write(msg + '\n')
+        self.origin.index.add(['A.cs'])
+        author = Actor('dev', 'dev@mail')
+        return self.origin.index.commit(msg, author=author, committer=author).hexsha
+
+    def test_mirror_fetches_new_commits(self):
+        path = update_mirror(self.url, self.cache)
+        self.assertEqual(mirror_path(self.url, self.cache), path)
+        self.assertTrue(Repo(path).bare)
+
+        new_commit = self.commit('second')
+        with local_repository(self.url, self.cache) as local_path:
+            self.assertEqual(path, local_path)
+            self.assertEqual(new_commit, Repo(local_path).head.commit.hexsha)
+
+    def test_mirror_used_when_not_reachable(self):
+        path = update_mirror(self.url, self.cache)
+        os.rename(self.origin.working_dir, self.origin.working_dir + '-moved')
+
+        self.assertEqual(path, update_mirror(self.url, self.cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from difflib import SequenceMatcher
+
+import lizard
+from pydriller.domain.commit import Method
+
+from main import get_dict_content_of_methods
+from utils.similarity import get_similar_candidates, get_pairs_of_similar_methods
+from utils.sourcelines import SourceLines
+
+
+class MyTestCase(unittest.TestCase):
+
+    methods_before = {
+        "A::Load( string path)": "Load( string path){var text = File.ReadAllText(path);return Parse(text);}",
+        "A::Save( string path)": "Save( string path){var text = Serialize(this);File.WriteAllText(path, text);}",
+        "A::Clear()": "Clear(){items.Clear();count = 0;}"
+    }
+
+    methods_current = {
+        "A::LoadFile( string path)": "LoadFile( string path){var text = File.ReadAllText(path);return Parse(text);}",
+        "A::SaveFile( string path)": "SaveFile( string path){var text = Serialize(this);"
+                                     "File.WriteAllText(path, text);}",
+        "A::Draw( Graphics g)": "Draw( Graphics g){g.DrawRectangle(pen, bounds);}"
+    }
+
+    def test_candidates_same_as_all_comparisons(self):
+        expected = {}
+        for k1, c1 in self.methods_before.items():
+            sm = SequenceMatcher(isjunk=lambda x: x in " \t")
+            sm.set_seq2(c1)
+            for k2, c2 in self.methods_current.items():
+                sm.set_seq1(c2)
+                if sm.ratio() >= 0.6:
+                    expected[(k1, k2)] = sm.ratio()
+
+        self.assertEqual(expected, get_similar_candidates(self.methods_before, self.methods_current,
+                                                          per_method=len(self.methods_current)))
+        self.assertEqual(expected, get_similar_candidates(self.methods_before, self.methods_current))
+
+    def test_pairs_of_similar_methods(self):
+        pairs = get_pairs_of_similar_methods(self.methods_before, self.methods_current)
+
+        self.assertEqual([("A::Load( string path)", "A::LoadFile( string path)"),
+                          ("A::Save( string path)", "A::SaveFile( string path)")], pairs)
+
+    def test_pairs_maximize_total_similarity(self):
+        # greedily, a1 would take b1 (the most similar) and leave a2 without a pair
+        before = {"a1": "abcdefghij", "a2": "abcdefgXYZ"}
+        current = {"b1": "abcdefghiQ", "b2": "abcdeRSTij"}
+
+        pairs = get_pairs_of_similar_methods(before, current)
+
+        self.assertEqual([("a1", "b2"), ("a2", "b1")], pairs)
+
+    def test_many_alike_methods(self):
+        before = {'A::GetValue{}()'.format(i): 'GetValue{}(){{return this.value{};}}'.format(i, i) for i in range(100)}
+        current = {'A::GetItem{}()'.format(i): 'GetItem{}(){{return this.item{};}}'.format(i, i) for i in range(100)}
+
+        self.assertEqual([('A::GetValue{}()'.format(i), 'A::GetItem{}()'.format(i)) for i in range(100)],
+                         get_pairs_of_similar_methods(before, current))
+
+    def test_texts_of_methods_with_the_same_long_name(self):
+        source = '\n'.join(['namespace N', '{', '    class A', '    {', '#if DEBUG',
+                            '        public int Foo(int a)', '        {', '            return a + 1;', '        }',
+                            '#else',
+                            '        public int Foo(int a)', '        {', '            return a + 2;', '        }',
+                            '#endif', '    }', '}'])
+        methods = [Method(f) for f in lizard.analyze_file.analyze_source_code('A.cs', source).function_list]
+        source_lines = SourceLines(source)
+
+        self.assertEqual(2, len(methods))
+        self.assertNotEqual(source_lines.method_text(methods[0]), source_lines.method_text(methods[1]))
+        # as a dict of the texts by long name, the last method is kept
+        self.assertEqual({'N::A::Foo( int a)': source_lines.method_text(methods[1])},
+                         get_dict_content_of_methods(SourceLines(source), methods))
+        self.assertIn('a + 2', source_lines.method_text(methods[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import filecmp
+import os
+import subprocess
+import tempfile
+import unittest
+
+import main
+from utils.synthetic import SyntheticRepository
+
+CLASS_SOURCE = """namespace N
+{{
+    class {0}
+    {{
+        public int Foo(int a)
+        {{
+            int b = a + {1};
+            return b;
+        }}
+    }}
+}}
+"""
+
+
+def commit_file(repo, name, value, day):
+    with open(os.path.join(repo, name + '.cs'), 'w') as f:
+        f.write(CLASS_SOURCE.format(name, value))
+    env = dict(os.environ, GIT_AUTHOR_DATE='2020-01-{:02d}T12:00:00'.format(day),
+               GIT_COMMITTER_DATE='2020-01-{:02d}T12:00:00'.format(day))
+    subprocess.run(['git', 'add', '-A'], cwd=repo, check=True)
+    subprocess.run(['git', 'commit', '-q', '-m', '{} {}'.format(name, value)], cwd=repo, check=True, env=env)
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_snapshots(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            repo = SyntheticRepository(os.path.join(tmp_folder, 'repo'), nr_commits=20, nr_files=4).generate()
+            subprocess.run(['git', 'tag', 'v1', 'HEAD~12'], cwd=repo, check=True)
+            subprocess.run(['git', 'tag', 'v2', 'HEAD~4'], cwd=repo, check=True)
+            for folder in ['cumulative', 'intervals', 'expected']:
+                os.makedirs(os.path.join(tmp_folder, folder))
+
+            main.reset_state()
+            main.mine_snapshots(repo, os.path.join(tmp_folder, 'cumulative'), tags=['v2', 'v1'])
+            main.reset_state()
+            main.mine_snapshots(repo, os.path.join(tmp_folder, 'intervals'), tags=['v1', 'v2'], cumulative=False)
+            main.reset_state()
+            main.mine(repo, to_tag='v2')
+            main.write_to_csv(main.files, os.path.join(tmp_folder, 'expected', 'commits-to-v2.csv'))
+            main.reset_state()
+
+            self.assertEqual(['commits-to-v1.csv', 'commits-to-v2.csv', 'removed-to-v1.csv', 'removed-to-v2.csv'],
+                             sorted(os.listdir(os.path.join(tmp_folder, 'cumulative'))))
+            self.assertEqual(['commits-to-v1.csv', 'commits-v1-to-v2.csv', 'removed-to-v1.csv',
+                              'removed-v1-to-v2.csv'], sorted(os.listdir(os.path.join(tmp_folder, 'intervals'))))
+            self.assertTrue(filecmp.cmp(os.path.join(tmp_folder, 'cumulative', 'commits-to-v1.csv'),
+                                        os.path.join(tmp_folder, 'intervals', 'commits-to-v1.csv'), shallow=False))
+            self.assertTrue(filecmp.cmp(os.path.join(tmp_folder, 'cumulative', 'commits-to-v2.csv'),
+                                        os.path.join(tmp_folder, 'expected', 'commits-to-v2.csv'), shallow=False))
+
+    def test_before_and_after_tag(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            repo = SyntheticRepository(os.path.join(tmp_folder, 'repo'), nr_commits=20, nr_files=4).generate()
+            subprocess.run(['git', 'tag', 'v1', 'HEAD~8'], cwd=repo, check=True)
+            for folder in ['tag', 'expected']:
+                os.makedirs(os.path.join(tmp_folder, folder))
+
+            main.reset_state()
+            main.mine_before_and_after_tag(repo, os.path.join(tmp_folder, 'tag'), tag='v1')
+            main.reset_state()
+            # the two runs of mine, as done before mine_before_and_after_tag mined both ranges from one clone
+            expected = os.path.join(tmp_folder, 'expected')
+            main.mine(repo, to_tag='v1')
+            main.write_to_csv(main.files, os.path.join(expected, 'commits-to-v1.csv'))
+            main.reset_changed_methods_and_save_name()
+            main.write_to_cvs_trash(main.commit_deleted_methods, os.path.join(expected, 'removed-to-v1.csv'))
+            main.commit_deleted_methods.clear()
+            main.mine(repo, from_tag='v1')
+            main.write_to_csv(main.files, os.path.join(expected, 'commits-from-v1.csv'), include_prev_name=True)
+            main.write_to_cvs_trash(main.commit_deleted_methods, os.path.join(expected, 'removed-from-v1.csv'))
+            main.reset_state()
+
+            file_names = ['commits-from-v1.csv', 'commits-to-v1.csv', 'removed-from-v1.csv', 'removed-to-v1.csv']
+            self.assertEqual(file_names, sorted(os.listdir(os.path.join(tmp_folder, 'tag'))))
+            for file_name in file_names:
+                self.assertTrue(filecmp.cmp(os.path.join(tmp_folder, 'tag', file_name),
+                                            os.path.join(expected, file_name), shallow=False), file_name)
+
+    def test_snapshots_with_merge(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            repo = os.path.join(tmp_folder, 'repo')
+            os.makedirs(repo)
+            subprocess.run(['git', 'init', '-q', '-b', 'main'], cwd=repo, check=True)
+            subprocess.run(['git', 'config', 'user.name', 'test'], cwd=repo, check=True)
+            subprocess.run(['git', 'config', 'user.email', 'test@example.com'], cwd=repo, check=True)
+            commit_file(repo, 'A', 1, 1)
+            commit_file(repo, 'B', 1, 2)
+            # the commit of the side branch is older than the tagged one, it is not one of its ancestors
+            subprocess.run(['git', 'checkout', '-q', '-b', 'feat'], cwd=repo, check=True)
+            commit_file(repo, 'B', 2, 3)
+            subprocess.run(['git', 'checkout', '-q', 'main'], cwd=repo, check=True)
+            commit_file(repo, 'A', 2, 4)
+            subprocess.run(['git', 'tag', 't1'], cwd=repo, check=True)
+            subprocess.run(['git', 'merge', '-q', '--no-ff', '-m', 'merge', 'feat'], cwd=repo, check=True)
+            commit_file(repo, 'B', 3, 6)
+            subprocess.run(['git', 'tag', 't2'], cwd=repo, check=True)
+            for folder in ['snapshots', 'expected']:
+                os.makedirs(os.path.join(tmp_folder, folder))
+
+            main.reset_state()
+            main.mine_snapshots(repo, os.path.join(tmp_folder, 'snapshots'), tags=['t1', 't2'])
+            for tag in ['t1', 't2']:
+                main.reset_state()
+                main.mine(repo, to_tag=tag)
+                main.write_to_csv(main.files, os.path.join(tmp_folder, 'expected', 'commits-to-' + tag + '.csv'))
+                main.write_to_cvs_trash(main.commit_deleted_methods,
+                                        os.path.join(tmp_folder, 'expected', 'removed-to-' + tag + '.csv'))
+            main.reset_state()
+
+            for file_name in ['commits-to-t1.csv', 'removed-to-t1.csv', 'commits-to-t2.csv', 'removed-to-t2.csv']:
+                self.assertTrue(filecmp.cmp(os.path.join(tmp_folder, 'snapshots', file_name),
+                                            os.path.join(tmp_folder, 'expected', file_name), shallow=False),
+                                file_name)
+            with open(os.path.join(tmp_folder, 'snapshots', 'commits-to-t1.csv')) as f:
+                self.assertIn('N::B::Foo( int a);1;', f.read())
+
+            subprocess.run(['git', 'tag', 'side', 'feat'], cwd=repo, check=True)
+            with self.assertRaises(ValueError):
+                main.mine_snapshots(repo, os.path.join(tmp_folder, 'snapshots'), tags=['t1', 'side'])
+            main.reset_state()
+
+
+if __name__ == '__main__':
+    unittest.main()
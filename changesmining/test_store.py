@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from pydriller.domain.developer import Developer
+
+from utils.change import ChangedFile, ChangedMethod, Commit
+from utils.store import MiningStore
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_folder.name, 'store.db')
+        self.store = MiningStore(self.path)
+
+    def tearDown(self):
+        self.store.connection.close()
+        self.tmp_folder.cleanup()
+
+    def add_commit(self, index):
+        commit = Commit(index, datetime(2020, 1, 1, tzinfo=timezone(timedelta(hours=2))),
+                        Developer('dev', 'dev@mail'), 'msg', 'hash{}'.format(index))
+        self.store.commits.append(commit)
+        return commit
+
+    def test_state_kept_between_flushes(self):
+        commit = self.add_commit(0)
+        c_file = ChangedFile('A.cs', 'src/A.cs')
+        for name in ['Load()', 'Save()']:
+            m = ChangedMethod(name, 'Ns::A::')
+            m.add_change(commit, 3)
+            c_file.add_method(m)
+        self.store.files['src/A.cs'] = c_file
+        self.store.files['src/B.cs'] = ChangedFile('B.cs', 'src/B.cs')
+        self.store.flush('hash0')
+
+        commit = self.add_commit(1)
+        c_file = self.store.files['src/A.cs']
+        c_file.methods[0].add_change(commit, 2)
+        self.store.trash[commit] = [c_file.remove_methods([c_file.methods[1]])]
+        # renamed file, added at the end
+        self.store.files['src/C.cs'] = self.store.files.pop('src/A.cs')
+        self.store.flush('hash1')
+
+        store = MiningStore(self.path)
+        self.assertEqual('hash1', store.last_commit)
+        self.assertEqual(['src/B.cs', 'src/C.cs'], [path for path, _ in store.files.items()])
+        methods = store.files['src/C.cs'].methods
+        self.assertEqual([('Load()', [(0, 3), (1, 2)])], [(m.name, list(m.iter_changes())) for m in methods])
+
+        trash = list(store.trash.items())
+        self.assertEqual(1, len(trash))
+        self.assertEqual('hash1', trash[0][0].commit_hash)
+        self.assertEqual(self.store.commits[0].date, trash[0][0].date)
+        self.assertEqual([['Save()']], [[m.name for m in methods] for methods in trash[0][1]])
+        store.connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from pydriller.domain.developer import Developer
+
+from utils.change import ChangedFile, ChangedMethod, Commit
+from windows import get_window_metrics, load_mining_state, parse_window, select_commits
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.commits = [Commit(i, datetime(2020, i + 1, 1, tzinfo=timezone.utc), Developer('dev', 'dev@mail'),
+                               'msg', '{:x}'.format(i + 10) * 40) for i in range(4)]
+        c_file = ChangedFile('A.cs', 'src/A.cs')
+        load = ChangedMethod('Load()', 'Ns::A::')
+        for c in self.commits:
+            load.add_change(c, c.index + 1)
+        c_file.add_method(load)
+        self.files = {'src/A.cs': c_file}
+
+    def test_date_and_commit_windows(self):
+        self.assertEqual(bytearray([0, 1, 1, 0]), select_commits(self.commits, since='2020-02-01', until='2020-04-01'))
+        self.assertEqual(bytearray([0, 0, 1, 1]), select_commits(self.commits, from_commit=self.commits[2].commit_hash))
+        self.assertEqual(bytearray([1, 1, 1, 0]),
+                         select_commits(self.commits, to_commit=self.commits[2].commit_hash[:8]))
+
+    def test_parse_window(self):
+        self.assertEqual(('v1', {'since': '2020-01-01'}), parse_window('v1=2020-01-01..'))
+        self.assertEqual(('v2', {'from_commit': 'abcdef12', 'until': '2021-01-01'}),
+                         parse_window('v2=abcdef12..2021-01-01'))
+        # a basic date is not a commit hash, even if it has the same characters
+        self.assertEqual(('v3', {'since': '20200101', 'to_commit': '1234567'}), parse_window('v3=20200101..1234567'))
+
+    def test_missing_mining_state(self):
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            path = os.path.join(tmp_folder, 'state.db')
+            with self.assertRaises(FileNotFoundError):
+                load_mining_state(path)
+            self.assertFalse(os.path.exists(path))
+
+    def test_metrics_of_several_windows(self):
+        selections = [select_commits(self.commits, until='2020-03-01'), select_commits(self.commits)]
+
+        self.assertEqual([['src/A.cs', 'A.cs', 'Ns::A::Load()', 2, 3, 4, 10]],
+                         list(get_window_metrics(self.files, selections)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,34 @@
 #!/usr/bin/env python3
 
+from array import array
+
+
+def _long_name_key(long_name):
+    return long_name.replace(' ', '')
+
+
+def _name_key(name):
+    return name[:name.rfind('(')]
+
+
 class ChangedFile:
+    """Methods of a file, indexed by long name (without spaces) and by name (without parameters).
+
+    The methods must be added, renamed and removed through this class to keep the indexes consistent.
+    """
+    __slots__ = ('filename', 'full_path', '_methods', '_order', '_by_long_name', '_by_name')
+
     def __init__(self, filename, full_path):
         self.filename = filename
         self.full_path = full_path
-        self.methods = []
+        self._methods = {}  # method -> insertion order
+        self._order = 0
+        self._by_long_name = {}
+        self._by_name = {}
+
+    @property
+    def methods(self):
+        return list(self._methods)
 
     def set_filename(self, filename):
         self.filename = filename
@@ -12,43 +36,122 @@ class ChangedFile:
     def set_full_path(self, full_path):
         self.full_path = full_path
 
+    def _index(self, method):
+        for bucket in (self._by_long_name.setdefault(_long_name_key(method.class_path + method.name), []),
+                       self._by_name.setdefault(_name_key(method.name), [])):
+            bucket.append(method)
+            # a renamed method keeps its place: the methods are found in the order they were added
+            if len(bucket) > 1 and self._methods[bucket[-2]] > self._methods[method]:
+                bucket.sort(key=self._methods.get)
+
+    def _unindex(self, method):
+        for index, key in ((self._by_long_name, _long_name_key(method.class_path + method.name)),
+                           (self._by_name, _name_key(method.name))):
+            bucket = index[key]
+            bucket.remove(method)
+            if not bucket:
+                del index[key]
+
+    def add_method(self, method):
+        self._methods[method] = self._order
+        self._order += 1
+        self._index(method)
+
+    def remove_methods(self, methods):
+        """Removes the methods and returns them in the order they were added to the file"""
+        removed = sorted(set(methods), key=self._methods.get)
+        for m in removed:
+            del self._methods[m]
+            self._unindex(m)
+        return removed
+
+    def rename_method(self, method, name, class_path):
+        self._unindex(method)
+        method.name = name
+        method.class_path = class_path
+        self._index(method)
+
+    def find_by_long_name(self, long_name):
+        """Methods with the same long name, ignoring the spaces"""
+        return list(self._by_long_name.get(_long_name_key(long_name), []))
+
+    def find_by_name(self, name):
+        """Methods with the same name, ignoring the parameters"""
+        return list(self._by_name.get(_name_key(name), []))
+
+    def has_long_name(self, long_name):
+        return any((m.class_path + m.name) == long_name for m in self._by_long_name.get(_long_name_key(long_name), []))
+
 
 class ChangedMethod:
+    """The changes are kept as pairs (commit index, changed lines) in a compact array"""
+    __slots__ = ('name', 'class_path', 'changes', 'previous_long_name')
+
     def __init__(self, name, class_path):
         self.name = name
         self.class_path = class_path
-        self.commits = []
+        self.changes = array('i')
         self.previous_long_name = ''
 
+    def add_change(self, commit, changed_lines=0):
+        self.changes.append(commit.index)
+        self.changes.append(changed_lines)
+
+    def clear_changes(self):
+        del self.changes[:]
+
+    def nr_changes(self):
+        return len(self.changes) // 2
+
+    def changed_lines(self):
+        return sum(self.changes[1::2])
+
+    def iter_changes(self):
+        """Yields (commit index, changed lines) for each change"""
+        return zip(self.changes[0::2], self.changes[1::2])
+
 
 class Commit:
-    def __init__(self, date, author, msg, c_hash):
+    """A mined commit; created once per commit and referred by its index in the list of mined commits"""
+    __slots__ = ('index', 'date', 'author', 'msg', 'commit_hash')
+
+    def __init__(self, index, date, author, msg, c_hash):
+        self.index = index
         self.date = date
         self.author = author
         self.msg = msg
         self.commit_hash = c_hash
-        self.changed_lines = 0
 
 
 class MethodsSplit:
     def __init__(self, modification):
-        self.changed = modification.changed_methods
         self.before = modification.methods_before
         self.current = modification.methods
-
-        before_long_names = [m.long_name for m in self.before]
-        current_long_names = [m.long_name for m in self.current]
-
-        self.obsolete = [m for m in self.changed if m.long_name not in current_long_names]
-        self.new = [m for m in self.changed if m.long_name not in before_long_names]
-        self.updated = [m for m in self.changed if (m.long_name in before_long_names) and (m.long_name in current_long_names)]
+        # pydriller gives them in the order of a set, which changes from a run to another; in the order of the file
+        positions = {id(m): i for i, m in enumerate(self.current + self.before)}
+        self.changed = sorted(modification.changed_methods, key=lambda m: positions.get(id(m), len(positions)))
+
+        # long name -> first method with that name
+        self.before_by_long_name = {}
+        for m in self.before:
+            self.before_by_long_name.setdefault(m.long_name, m)
+        self.current_by_long_name = {}
+        for m in self.current:
+            self.current_by_long_name.setdefault(m.long_name, m)
+
+        self.obsolete = [m for m in self.changed if m.long_name not in self.current_by_long_name]
+        self.new = [m for m in self.changed if m.long_name not in self.before_by_long_name]
+        self.updated = [m for m in self.changed
+                        if (m.long_name in self.before_by_long_name) and (m.long_name in self.current_by_long_name)]
 
         self.names_obsolete = [m.long_name for m in self.obsolete]
         self.names_new = [m.long_name for m in self.new]
         self.names_updated = [m.long_name for m in self.updated]
 
-        self.names_before_without_obsolete = [name_m for name_m in before_long_names if name_m not in self.names_obsolete]
-        self.names_current_without_new = [name_m for name_m in current_long_names if name_m not in self.names_new]
+        obsolete = set(self.names_obsolete)
+        new = set(self.names_new)
+        self.names_before_without_obsolete = [m.long_name for m in self.before if m.long_name not in obsolete]
+        self.names_current_without_new = [m.long_name for m in self.current if m.long_name not in new]
 
     def exist_new(self):
         return len(self.new) > 0
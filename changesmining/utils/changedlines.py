@@ -0,0 +1,97 @@
+"""
+Engines counting the changed lines of a method: the lines of the previous content which are deleted or replaced,
+except the comments and the lines with at most one character (e.g. blank lines and braces).
+"""
+
+from difflib import Differ, SequenceMatcher
+
+
+def is_counted(line: str) -> bool:
+    line = line.strip(" \n")
+    return not line.startswith('//') and len(line) > 1
+
+
+def count_with_differ(text_before, text_current) -> int:
+    changed_lines = 0
+    for line in Differ().compare(text_before, text_current):
+        if line.startswith('-') and is_counted(line[1:]):
+            changed_lines += 1
+    return changed_lines
+
+
+def _count_deleted(a, alo, ahi) -> int:
+    return sum(1 for line in a[alo:ahi] if is_counted(line))
+
+
+def _count_replaced(a, alo, ahi, b, blo, bhi) -> int:
+    """The counted lines of a[alo:ahi] marked as deleted by Differ when it replaces them with b[blo:bhi].
+
+    The same steps as Differ._fancy_replace, counting the deleted lines instead of formatting them: the most
+    similar pair of lines (or else the first identical pair) splits the blocks, the lines before and after it
+    are compared in the same way, and the lines of a block without such a pair are all deleted.
+    """
+    best_ratio, cutoff = 0.74, 0.75
+    cruncher = SequenceMatcher(None)
+    eqi, eqj = None, None
+    best_i, best_j = None, None
+    for j in range(blo, bhi):
+        bj = b[j]
+        cruncher.set_seq2(bj)
+        for i in range(alo, ahi):
+            ai = a[i]
+            if ai == bj:
+                if eqi is None:
+                    eqi, eqj = i, j
+                continue
+            cruncher.set_seq1(ai)
+            if cruncher.real_quick_ratio() > best_ratio and cruncher.quick_ratio() > best_ratio and \
+                    cruncher.ratio() > best_ratio:
+                best_ratio, best_i, best_j = cruncher.ratio(), i, j
+    if best_ratio < cutoff:
+        if eqi is None:
+            return _count_deleted(a, alo, ahi)
+        best_i, best_j = eqi, eqj
+    else:
+        eqi = None
+
+    changed_lines = _count_helper(a, alo, best_i, b, blo, best_j)
+    # the similar (not identical) line of the pair is marked as deleted and added
+    if eqi is None and is_counted(a[best_i]):
+        changed_lines += 1
+    return changed_lines + _count_helper(a, best_i + 1, ahi, b, best_j + 1, bhi)
+
+
+def _count_helper(a, alo, ahi, b, blo, bhi) -> int:
+    if alo < ahi:
+        return _count_replaced(a, alo, ahi, b, blo, bhi) if blo < bhi else _count_deleted(a, alo, ahi)
+    return 0
+
+
+def count_with_opcodes(text_before, text_current) -> int:
+    """Same count as count_with_differ, from the line opcodes only.
+
+    Differ marks all the lines of a replaced block as deleted, except the identical lines it pairs in the block.
+    A replaced block has identical lines only if the SequenceMatcher considers them popular (usually braces
+    or blank lines, which are not counted anyway); if they are counted lines, the block is compared as Differ does.
+    """
+    sm = SequenceMatcher(None, text_before, text_current)
+    changed_lines = 0
+    for tag, i1, i2, j1, j2 in sm.get_opcodes():
+        if tag == 'equal' or tag == 'insert':
+            continue
+        if tag == 'replace' and sm.bpopular and any(is_counted(line) for line in
+                                                    set(text_before[i1:i2]).intersection(text_current[j1:j2])):
+            changed_lines += _count_replaced(text_before, i1, i2, text_current, j1, j2)
+            continue
+        changed_lines += _count_deleted(text_before, i1, i2)
+    return changed_lines
+
+
+ENGINES = {
+    'differ': count_with_differ,
+    'opcodes': count_with_opcodes
+}
+
+
+def count_changed_lines(text_before, text_current, engine: str = 'opcodes') -> int:
+    return ENGINES[engine](text_before, text_current)
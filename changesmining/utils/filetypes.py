@@ -0,0 +1,20 @@
+from typing import Iterable, Tuple
+
+from lizard_languages import languages
+
+
+def get_file_types(language_names: Iterable[str]) -> Tuple[str, ...]:
+    """The file extensions (with the dot) lizard parses for the given languages, e.g. ['csharp', 'java']"""
+    names = {name.lower() for name in language_names}
+    file_types = []
+    for reader in languages():
+        if names.intersection(name.lower() for name in reader.language_names):
+            file_types += ['.' + ext for ext in reader.ext]
+            names.difference_update(name.lower() for name in reader.language_names)
+    if names:
+        raise ValueError('Languages not supported by lizard: {}'.format(', '.join(sorted(names))))
+    return tuple(file_types)
+
+
+def is_file_type(filename: str, file_types: Tuple[str, ...]) -> bool:
+    return filename.endswith(file_types)
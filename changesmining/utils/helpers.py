@@ -1,4 +1,9 @@
 import csv
+import gzip
+import os
+import pickle
+
+from utils.ownership import OWNERSHIP_COLUMNS, RECENT_DAYS, CommitAttributes, get_ownership_metrics
 
 
 def split_method_long_name(long_name: str) -> (str, str):
@@ -15,38 +20,31 @@ def print_actual_files(files):
         print('ooooooooooo', key)
         print(v_f.filename, v_f.full_path)
         for mp in v_f.methods:
-            print(mp.class_path + mp.name, ' nr of commits: ', len(mp.commits),
-                  'nr of chg lines: ', sum([c.changed_lines for c in mp.commits]))
+            print(mp.class_path + mp.name, ' nr of commits: ', mp.nr_changes(),
+                  'nr of chg lines: ', mp.changed_lines())
 
 
-def write_to_csv(files, file_path: str, include_prev_name: bool = False):
+def write_to_csv(files, file_path: str, include_prev_name: bool = False, commits=None,
+                 recent_days: int = RECENT_DAYS):
+    """With the mined commits, the ownership metrics of the methods (see utils.ownership) follow ChgLines"""
+    commit_attributes = CommitAttributes(commits) if commits is not None else None
     with open(file_path, 'w') as csvfile:
         fieldnames = ['Full_path', 'Filename', 'Method', 'Changes', 'ChgLines']
+        if commit_attributes is not None:
+            fieldnames += OWNERSHIP_COLUMNS
         if include_prev_name:
             fieldnames.append('Previous_name')
-        file_writer = csv.DictWriter(csvfile, fieldnames, delimiter=';', lineterminator='\n')
-        file_writer.writeheader()
+        file_writer = csv.writer(csvfile, delimiter=';', lineterminator='\n')
+        file_writer.writerow(fieldnames)
         for key, v_f in files.items():
             for mp in v_f.methods:
                 method_full_name = (mp.class_path + mp.name)
-                chg_lines = sum([c.changed_lines for c in mp.commits])
+                row = [v_f.full_path, v_f.filename, method_full_name, mp.nr_changes(), mp.changed_lines()]
+                if commit_attributes is not None:
+                    row += get_ownership_metrics(mp, commit_attributes, recent_days)
                 if include_prev_name:
-                    file_writer.writerow({
-                        'Full_path': v_f.full_path,
-                        'Filename': v_f.filename,
-                        'Method': method_full_name,
-                        'Changes': len(mp.commits),
-                        'ChgLines': chg_lines,
-                        'Previous_name': mp.previous_long_name
-                    })
-                else:
-                    file_writer.writerow({
-                        'Full_path': v_f.full_path,
-                        'Filename': v_f.filename,
-                        'Method': method_full_name,
-                        'Changes': len(mp.commits),
-                        'ChgLines': chg_lines
-                    })
+                    row.append(mp.previous_long_name)
+                file_writer.writerow(row)
 
 
 def write_to_cvs_trash(trash_methods, file_path):
@@ -58,11 +56,39 @@ def write_to_cvs_trash(trash_methods, file_path):
             flat_list = [item for sublist in methods for item in sublist]
             for mp in flat_list:
                 method_full_name = (mp.class_path + mp.name)
-                chg_lines = sum([c.changed_lines for c in mp.commits])
+                chg_lines = mp.changed_lines()
                 file_writer.writerow({
                     'Commit_hash': commit.commit_hash,
                     'Date': commit.date,
                     'Method': method_full_name,
-                    'Changes': len(mp.commits),
+                    'Changes': mp.nr_changes(),
                     'ChgLines': chg_lines
                 })
+
+
+CHECKPOINT_VERSION = 2
+
+
+def save_checkpoint(files, trash_methods, commits, last_commit: str, file_path: str):
+    """Saves the mining state; the file is replaced only once the new checkpoint is completely written"""
+    state = {
+        'version': CHECKPOINT_VERSION,
+        'last_commit': last_commit,
+        'files': files,
+        'commit_deleted_methods': trash_methods,
+        'mined_commits': commits
+    }
+    tmp_path = file_path + '.tmp'
+    with gzip.open(tmp_path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, file_path)
+
+
+def load_checkpoint(file_path: str):
+    """Returns the files, the removed methods, the mined commits and the hash of the last mined commit"""
+    with gzip.open(file_path, 'rb') as f:
+        state = pickle.load(f)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError('Checkpoint {} has version {}, expected {}'
+                         .format(file_path, state.get('version'), CHECKPOINT_VERSION))
+    return state['files'], state['commit_deleted_methods'], state['mined_commits'], state['last_commit']
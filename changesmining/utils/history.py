@@ -0,0 +1,98 @@
+"""
+Long-format history of the method changes: a row for each change of a method in a commit, saved as Parquet.
+The methods without changes (possible after the changes are reset) have a row without commit.
+The aggregated csv of write_to_csv can be derived from it, see history_to_csv.
+
+Requires pyarrow, which is only imported when the history is used.
+"""
+
+import csv
+
+HISTORY_COLUMNS = ['Method_id', 'Full_path', 'Filename', 'Method', 'Previous_name', 'Commit_hash', 'Date', 'Author',
+                   'ChgLines']
+ROW_GROUP_SIZE = 100000
+
+
+def _history_schema(pa):
+    return pa.schema([
+        ('Method_id', pa.int64()),
+        ('Full_path', pa.string()),
+        ('Filename', pa.string()),
+        ('Method', pa.string()),
+        ('Previous_name', pa.string()),
+        ('Commit_hash', pa.string()),
+        ('Date', pa.timestamp('s', tz='UTC')),
+        ('Author', pa.string()),
+        ('ChgLines', pa.int32())
+    ])
+
+
+def iter_history_rows(files, commits):
+    """Yields the history rows of the methods of the files; the changes refer to the commits by index.
+
+    Method_id numbers the methods in the order of the files, as written by write_to_csv.
+    """
+    method_id = -1
+    for v_f in files.values():
+        for mp in v_f.methods:
+            method_id += 1
+            method_full_name = mp.class_path + mp.name
+            has_changes = False
+            for commit_index, changed_lines in mp.iter_changes():
+                commit = commits[commit_index]
+                has_changes = True
+                yield (method_id, v_f.full_path, v_f.filename, method_full_name, mp.previous_long_name,
+                       commit.commit_hash, commit.date, commit.author.name, changed_lines)
+            if not has_changes:
+                yield (method_id, v_f.full_path, v_f.filename, method_full_name, mp.previous_long_name, None, None,
+                       None, 0)
+
+
+def write_history(files, commits, file_path: str, row_group_size: int = ROW_GROUP_SIZE):
+    """Writes the history rows in row groups of row_group_size rows"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _history_schema(pa)
+    writer = pq.ParquetWriter(file_path, schema)
+    try:
+        columns = [[] for _ in HISTORY_COLUMNS]
+        written = False
+        for row in iter_history_rows(files, commits):
+            for column, value in zip(columns, row):
+                column.append(value)
+            if len(columns[0]) >= row_group_size:
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                columns = [[] for _ in HISTORY_COLUMNS]
+                written = True
+        if columns[0] or not written:
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+    finally:
+        writer.close()
+
+
+def history_to_csv(history_path: str, file_path: str, include_prev_name: bool = False):
+    """Writes the same csv as write_to_csv from a history file, reading it one row group at a time"""
+    import pyarrow.parquet as pq
+
+    methods = {}
+    parquet_file = pq.ParquetFile(history_path)
+    for i in range(parquet_file.num_row_groups):
+        table = parquet_file.read_row_group(i, columns=['Method_id', 'Full_path', 'Filename', 'Method',
+                                                        'Previous_name', 'Commit_hash', 'ChgLines'])
+        rows = zip(*(table.column(name).to_pylist() for name in table.column_names))
+        for method_id, full_path, filename, method, previous_name, commit_hash, changed_lines in rows:
+            if method_id not in methods:
+                methods[method_id] = [full_path, filename, method, 0, 0, previous_name]
+            if commit_hash is not None:
+                methods[method_id][3] += 1
+                methods[method_id][4] += changed_lines
+
+    with open(file_path, 'w') as csvfile:
+        fieldnames = ['Full_path', 'Filename', 'Method', 'Changes', 'ChgLines']
+        if include_prev_name:
+            fieldnames.append('Previous_name')
+        file_writer = csv.writer(csvfile, delimiter=';', lineterminator='\n')
+        file_writer.writerow(fieldnames)
+        for row in methods.values():
+            file_writer.writerow(row if include_prev_name else row[:5])
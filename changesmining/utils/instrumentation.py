@@ -0,0 +1,101 @@
+"""
+Optional instrumentation of the mining: the wall time of each commit split by phase, and counters.
+Disabled by default; then the phases and counters do nothing.
+"""
+
+import csv
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+PHASES = ['git diff', 'lizard', 'methods split', 'rename check', 'similarity', 'changed lines', 'csv write']
+COUNTERS = ['modifications', 'methods', 'similarity comparisons', 'changed lines comparisons', 'moved methods']
+
+
+class _NoPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_no_phase = _NoPhase()
+
+
+class MiningStats:
+    def __init__(self, enabled: bool = False):
+        self.reset(enabled)
+
+    def reset(self, enabled: bool):
+        self.enabled = enabled
+        self.commits = []  # per commit: hash, seconds, phases and counters
+        self.totals = OrderedDict((phase, 0.0) for phase in PHASES)
+        self.counters = OrderedDict((counter, 0) for counter in COUNTERS)
+        self._current = None
+        self._start = None
+
+    def start_commit(self, commit_hash: str):
+        if not self.enabled:
+            return
+        self._current = {
+            'hash': commit_hash,
+            'seconds': 0.0,
+            'phases': OrderedDict((phase, 0.0) for phase in PHASES),
+            'counters': OrderedDict((counter, 0) for counter in COUNTERS)
+        }
+        self._start = time.perf_counter()
+
+    def end_commit(self):
+        if not self.enabled or self._current is None:
+            return
+        self._current['seconds'] = time.perf_counter() - self._start
+        self.commits.append(self._current)
+        self._current = None
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _no_phase
+        return self._timed_phase(name)
+
+    @contextmanager
+    def _timed_phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.totals[name] += elapsed
+            if self._current is not None:
+                self._current['phases'][name] += elapsed
+
+    def count(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        self.counters[name] += n
+        if self._current is not None:
+            self._current['counters'][name] += n
+
+    def slowest_commits(self, n: int = 10):
+        return sorted(self.commits, key=lambda c: c['seconds'], reverse=True)[:n]
+
+    def print_report(self, n: int = 10):
+        print('Total seconds by phase:', ', '.join('{}: {:.3f}'.format(k, v) for k, v in self.totals.items()))
+        print('Counters:', ', '.join('{}: {}'.format(k, v) for k, v in self.counters.items()))
+        print('Slowest {} commits:'.format(n))
+        for c in self.slowest_commits(n):
+            phases = ', '.join('{}: {:.3f}'.format(k, v) for k, v in c['phases'].items() if v > 0)
+            print('{} {:.3f}s ({}) {}'.format(c['hash'], c['seconds'], phases, dict(c['counters'])))
+
+    def write_json(self, file_path: str):
+        with open(file_path, 'w') as f:
+            json.dump({'totals': self.totals, 'counters': self.counters, 'commits': self.commits}, f, indent=1)
+
+    def write_csv(self, file_path: str):
+        with open(file_path, 'w') as csvfile:
+            file_writer = csv.writer(csvfile, delimiter=';', lineterminator='\n')
+            file_writer.writerow(['Commit_hash', 'Seconds'] + PHASES + COUNTERS)
+            for c in self.commits:
+                file_writer.writerow([c['hash'], c['seconds']] + list(c['phases'].values())
+                                     + list(c['counters'].values()))
@@ -0,0 +1,99 @@
+"""
+Index of the methods removed by a commit, to find those moved to another file by the same commit.
+
+A method is found by the hash of its normalized body, or by a MinHash sketch of its lines: the sketch is split
+in bands, and the methods with an equal band are compared by the share of equal hashes (the estimated Jaccard
+similarity of their lines). A lookup is one dict access per band, whatever the number of removed methods.
+"""
+
+import hashlib
+import random
+import zlib
+from typing import List
+
+_PRIME = (1 << 61) - 1
+
+
+def normalized_body(content: List[str]) -> List[str]:
+    """The lines of the method content (see utils.sourcelines) without the empty and comment lines"""
+    return [line for line in content if line and not line.startswith('//')]
+
+
+class _Entry:
+    __slots__ = ('item', 'content', 'group', 'sketch', 'matched')
+
+    def __init__(self, item, content, group, sketch):
+        self.item = item
+        self.content = content
+        self.group = group
+        self.sketch = sketch
+        self.matched = False
+
+
+class MoveIndex:
+    """Removed items (methods) by the content of their body; group is the file, an item is not matched in its group.
+
+    The bodies with less than min_lines lines (besides the braces) are not indexed: small methods as getters
+    are too often alike.
+    """
+
+    def __init__(self, bands: int = 8, rows: int = 2, threshold: float = 0.7, min_lines: int = 3):
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        self.min_lines = min_lines
+        rng = random.Random(0)
+        self._coefficients = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(bands * rows)]
+        self._by_hash = {}
+        self._by_band = {}
+
+    def _sketch(self, lines: List[str]):
+        line_hashes = {zlib.crc32(line.encode('utf-8')) for line in lines}
+        return tuple(min((a * h + b) % _PRIME for h in line_hashes) for a, b in self._coefficients)
+
+    def _band_keys(self, sketch):
+        return [(i, sketch[i * self.rows: (i + 1) * self.rows]) for i in range(self.bands)]
+
+    def _is_indexed(self, lines: List[str]) -> bool:
+        return sum(1 for line in lines if line not in ('{', '}')) >= self.min_lines
+
+    @staticmethod
+    def _body_hash(lines: List[str]) -> str:
+        return hashlib.sha1('\n'.join(lines).encode('utf-8')).hexdigest()
+
+    def add(self, item, content: List[str], group):
+        lines = normalized_body(content)
+        if not self._is_indexed(lines):
+            return
+        entry = _Entry(item, content, group, self._sketch(lines))
+        self._by_hash.setdefault(self._body_hash(lines), []).append(entry)
+        for key in self._band_keys(entry.sketch):
+            self._by_band.setdefault(key, []).append(entry)
+
+    def pop_match(self, content: List[str], group):
+        """Returns (item, content) of the removed item with the same or the most similar body, and removes it from
+        the index; None if there is none"""
+        lines = normalized_body(content)
+        if not self._is_indexed(lines):
+            return None
+
+        match = next((e for e in self._by_hash.get(self._body_hash(lines), [])
+                      if not e.matched and e.group != group), None)
+        if match is None:
+            sketch = self._sketch(lines)
+            best = self.threshold
+            for key in self._band_keys(sketch):
+                for e in self._by_band.get(key, []):
+                    if e.matched or e.group == group:
+                        continue
+                    similarity = sum(1 for x, y in zip(sketch, e.sketch) if x == y) / len(sketch)
+                    if similarity >= best and (match is None or similarity > best):
+                        match, best = e, similarity
+        if match is None:
+            return None
+        match.matched = True
+        return match.item, match.content
+
+    def clear(self):
+        self._by_hash = {}
+        self._by_band = {}
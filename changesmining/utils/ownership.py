@@ -0,0 +1,49 @@
+"""
+Author and ownership metrics of the methods, from the commits already kept for their changes: the number of
+distinct authors, the date of the last change, the days from it to the last mined commit and the changed lines
+in the last days. No other data is read from git.
+"""
+
+from datetime import timedelta
+
+OWNERSHIP_COLUMNS = ['Authors', 'Last_modified', 'Days_since_change', 'Recent_ChgLines']
+
+# the changed lines of the last days are counted in Recent_ChgLines
+RECENT_DAYS = 90
+
+
+class CommitAttributes:
+    """The date and the author (as a number) of each mined commit, by index, read once from the mined commits"""
+
+    def __init__(self, commits):
+        self.dates = []
+        self.authors = []
+        author_ids = {}
+        for c in commits:
+            if c.index >= len(self.dates):
+                self.dates.extend([None] * (c.index + 1 - len(self.dates)))
+                self.authors.extend([-1] * (c.index + 1 - len(self.authors)))
+            # the same developer can commit with several names, the email identifies it
+            author = (c.author.email or c.author.name or '').lower()
+            self.dates[c.index] = c.date
+            self.authors[c.index] = author_ids.setdefault(author, len(author_ids))
+        self.last_date = max((d for d in self.dates if d is not None), default=None)
+
+
+def get_ownership_metrics(method, commit_attributes: CommitAttributes, recent_days: int = RECENT_DAYS) -> list:
+    """Returns the values of OWNERSHIP_COLUMNS for the method, in one pass over its changes"""
+    authors = set()
+    last_modified = None
+    recent_lines = 0
+    recent_start = commit_attributes.last_date - timedelta(days=recent_days) if commit_attributes.last_date else None
+    for commit_index, changed_lines in method.iter_changes():
+        authors.add(commit_attributes.authors[commit_index])
+        date = commit_attributes.dates[commit_index]
+        if last_modified is None or date > last_modified:
+            last_modified = date
+        if date >= recent_start:
+            recent_lines += changed_lines
+
+    if last_modified is None:
+        return [0, '', '', 0]
+    return [len(authors), last_modified, (commit_attributes.last_date - last_modified).days, recent_lines]
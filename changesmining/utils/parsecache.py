@@ -0,0 +1,93 @@
+"""
+Cache of the lizard analysis of the sources, by git blob: the source of a file before a commit is the one after
+the previous commit changing it, so it is parsed once. The cache is kept in memory (least recently used entries
+are evicted) and optionally in a SQLite database, used again by the next runs.
+"""
+
+import os
+import pickle
+import sqlite3
+from collections import OrderedDict
+
+import lizard
+from pydriller.domain.commit import Method, Modification
+
+
+class ParseCache:
+    """The methods, nloc, complexity and token count of a source, by blob hash and file extension"""
+
+    def __init__(self, max_entries: int = 2000, path: str = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._connection = None
+        if path is not None:
+            # used by the workers of the pipelined mining at the same time
+            self._connection = sqlite3.connect(path, timeout=60)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS analyses (key TEXT PRIMARY KEY, analysis BLOB)')
+            self._connection.commit()
+
+    def _put(self, key: str, analysis):
+        self._entries[key] = analysis
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def analyze(self, blob_hash: str, filename: str, source_code: str):
+        """Returns (nloc, complexity, token count, methods) of the source, as computed by pydriller"""
+        key = '{}:{}'.format(blob_hash, os.path.splitext(filename)[1])
+        analysis = self._entries.get(key)
+        if analysis is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return analysis
+
+        if self._connection is not None:
+            row = self._connection.execute('SELECT analysis FROM analyses WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                analysis = pickle.loads(row[0])
+                self._put(key, analysis)
+                self.hits += 1
+                return analysis
+
+        self.misses += 1
+        result = lizard.analyze_file.analyze_source_code(filename, source_code)
+        analysis = (result.nloc, result.CCN, result.token_count, [Method(func) for func in result.function_list])
+        self._put(key, analysis)
+        if self._connection is not None:
+            self._connection.execute('INSERT OR REPLACE INTO analyses VALUES (?, ?)', (key, pickle.dumps(analysis)))
+            self._connection.commit()
+        return analysis
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class CachedModification(Modification):
+    """A pydriller Modification whose sources are analyzed through a ParseCache"""
+
+    def __init__(self, old_path, new_path, change_type, diff_and_sc, blob_before: str, blob_current: str,
+                 parse_cache: ParseCache):
+        super().__init__(old_path, new_path, change_type, diff_and_sc)
+        self._blob_before = blob_before
+        self._blob_current = blob_current
+        self._parse_cache = parse_cache
+
+    def _calculate_metrics(self, include_before=False):
+        # as Modification._calculate_metrics
+        if not self.language_supported:
+            return
+
+        if self.source_code and self._nloc is None:
+            self._nloc, self._complexity, self._token_count, methods = self._parse_cache.analyze(
+                self._blob_current, self.filename, self.source_code)
+            self._function_list = list(methods)
+
+        if include_before and self.source_code_before and not self._function_list_before:
+            methods = self._parse_cache.analyze(self._blob_before, self.filename, self.source_code_before)[3]
+            self._function_list_before = list(methods)
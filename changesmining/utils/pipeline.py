@@ -0,0 +1,93 @@
+"""
+Pipelined mining: worker processes read and parse the next commits while the methods of the current one are
+tracked. The tracking has to follow the order of the commits, the diffs, sources and lizard methods of each
+commit do not; the workers return them as plain data, consumed in order through a bounded queue of futures.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Tuple
+
+from git import Repo
+from pydriller import Commit
+from pydriller.utils.conf import Conf
+
+from utils.filetypes import is_file_type
+from utils.parsecache import ParseCache
+from utils.repository import get_modifications
+
+
+class ParsedModification:
+    """The attributes of a pydriller Modification used by the mining, computed by a worker"""
+    __slots__ = ('change_type', 'filename', 'old_path', 'new_path', 'diff', 'source_code', 'source_code_before',
+                 'methods', 'methods_before', 'changed_methods')
+
+    def __init__(self, mod):
+        self.change_type = mod.change_type
+        self.filename = mod.filename
+        self.old_path = mod.old_path
+        self.new_path = mod.new_path
+        self.diff = mod.diff
+        self.source_code = mod.source_code
+        self.source_code_before = mod.source_code_before
+        self.methods = mod.methods
+        self.methods_before = mod.methods_before
+        # a list of the same Method objects as methods and methods_before, in the order pydriller gives
+        self.changed_methods = mod.changed_methods
+
+
+class ParsedCommit:
+    """The attributes of a pydriller Commit used by the mining, with its parsed modifications"""
+    __slots__ = ('hash', 'committer_date', 'committer', 'msg', 'modifications')
+
+    def __init__(self, commit, modifications):
+        self.hash = commit.hash
+        self.committer_date = commit.committer_date
+        self.committer = commit.committer
+        self.msg = commit.msg
+        self.modifications = modifications
+
+
+_worker_repository = None
+_worker_conf = None
+_worker_file_types = None
+_worker_parse_cache = None
+
+
+def _init_worker(path_to_repo: str, file_types: Tuple[str, ...], parse_cache_settings):
+    global _worker_repository, _worker_conf, _worker_file_types, _worker_parse_cache
+    # not a pydriller GitRepository: opening it writes the git config, which fails in concurrent processes
+    _worker_repository = Repo(path_to_repo)
+    _worker_conf = Conf({'path_to_repo': path_to_repo})
+    _worker_file_types = file_types
+    if parse_cache_settings is not None:
+        # a cache per worker, the database (if any) is shared
+        _worker_parse_cache = ParseCache(*parse_cache_settings)
+
+
+def parse_commit(commit_hash: str) -> ParsedCommit:
+    commit = Commit(_worker_repository.commit(commit_hash), _worker_conf)
+    modifications = get_modifications(commit, lambda filename: is_file_type(filename, _worker_file_types),
+                                      _worker_parse_cache)
+    return ParsedCommit(commit, [ParsedModification(mod) for mod in modifications])
+
+
+def iter_parsed_commits(path_to_repo: str, hashes: Iterable[str], file_types: Tuple[str, ...], workers: int,
+                        parse_cache: ParseCache = None, prefetch: int = None):
+    """Yields the parsed commits in the order of the hashes; at most prefetch commits are parsed ahead"""
+    prefetch = prefetch or 4 * workers
+    parse_cache_settings = (parse_cache.max_entries, parse_cache.path) if parse_cache is not None else None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(path_to_repo, file_types, parse_cache_settings)) as executor:
+        queue = deque()
+        try:
+            for commit_hash in hashes:
+                queue.append(executor.submit(parse_commit, commit_hash))
+                if len(queue) >= prefetch:
+                    yield queue.popleft().result()
+            while queue:
+                yield queue.popleft().result()
+        finally:
+            # the consumer stopped early; the commits not started yet are not parsed
+            for future in queue:
+                future.cancel()
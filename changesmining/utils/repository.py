@@ -0,0 +1,165 @@
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+from git import NULL_TREE, Repo
+from pydriller import Commit
+from pydriller.domain.commit import Modification
+
+from utils.parsecache import CachedModification, ParseCache
+
+
+def is_remote(repository: str) -> bool:
+    return repository.startswith(("git@", "https://", "http://", "ssh://", "git://", "file://"))
+
+
+def mirror_path(repository: str, cache_folder: str) -> str:
+    """The folder of the mirror of the repository in the cache, named after the repository and a hash of its url"""
+    url = repository.rstrip('/')
+    name = re.sub(r'\.git$', '', url.rsplit('/', 1)[-1].rsplit(':', 1)[-1]) or 'repo'
+    return os.path.join(cache_folder, '{}-{}.git'.format(name, hashlib.sha1(url.encode()).hexdigest()[:12]))
+
+
+def update_mirror(repository: str, cache_folder: str) -> str:
+    """Clones a bare mirror of the repository in the cache, or fetches only the new objects if it exists.
+
+    Returns the path of the mirror; if the repository can not be fetched, the mirror is used as it is.
+    """
+    path = mirror_path(repository, cache_folder)
+    if os.path.isdir(path):
+        result = subprocess.run(['git', 'fetch', '--prune', '--quiet', 'origin'], cwd=path,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            print('Could not fetch {}, using the mirror as it is: {}'
+                  .format(repository, result.stderr.decode('utf-8', 'ignore').strip()))
+        return path
+
+    # cloned next to the final folder, which is there only once the clone is complete
+    os.makedirs(cache_folder, exist_ok=True)
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    Repo.clone_from(url=repository, to_path=tmp_path, mirror=True)
+    os.rename(tmp_path, path)
+    return path
+
+
+@contextmanager
+def local_repository(repository: str, cache_folder: str = None):
+    """Yields the local path of the repository; a remote one is cloned in a temporary folder, or mirrored
+    in the cache folder if given"""
+    if not is_remote(repository):
+        yield repository
+        return
+
+    if cache_folder is not None:
+        yield update_mirror(repository, cache_folder)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_folder:
+        repo_folder = os.path.join(tmp_folder, 'repo')
+        Repo.clone_from(url=repository, to_path=repo_folder)
+        yield repo_folder
+
+
+@contextmanager
+def shared_clone(path_to_repo: str):
+    """Clones a local repository sharing its objects; PyDriller writes the config of the repository it opens,
+    so the processes mining the same repository in parallel need their own clone"""
+    with tempfile.TemporaryDirectory() as tmp_folder:
+        repo_folder = os.path.join(tmp_folder, 'repo')
+        Repo.clone_from(url=os.path.abspath(path_to_repo), to_path=repo_folder, shared=True, no_checkout=True)
+        yield repo_folder
+
+
+_status_pattern = re.compile(r'^[ACDMRTUX][0-9]*$')
+
+
+def get_modified_paths(path_to_repo: str, hashes: List[str]) -> Dict[str, List[Tuple[str, str, str]]]:
+    """Returns for each commit the list of (status, old_path, new_path) of the modified files.
+
+    The paths are compared with the first parent (as PyDriller does), and the merge commits have no modifications.
+    """
+    result = {h: [] for h in hashes}
+    output = subprocess.run(['git', 'diff-tree', '--stdin', '-r', '-M', '--name-status', '--root', '-z'],
+                            cwd=path_to_repo, input=''.join(h + '\n' for h in hashes).encode(), stdout=subprocess.PIPE,
+                            check=True).stdout.decode('utf-8', 'ignore')
+
+    tokens = output.split('\0')
+    current = None
+    i = 0
+    while i < len(tokens):
+        token = tokens[i].strip('\n')
+        if token in result:
+            current = result[token]
+            i += 1
+        elif current is not None and _status_pattern.match(token):
+            if token[0] in 'RC':
+                current.append((token[0], tokens[i + 1], tokens[i + 2]))
+                i += 3
+            else:
+                old_path = tokens[i + 1] if token[0] != 'A' else None
+                new_path = tokens[i + 1] if token[0] != 'D' else None
+                current.append((token[0], old_path, new_path))
+                i += 2
+        else:
+            i += 1
+    return result
+
+
+def parse_diff_with_cache(commit: Commit, diff_index, parse_cache: ParseCache) -> List[Modification]:
+    """As Commit._parse_diff, with modifications analyzed through the parse cache"""
+    modifications = []
+    for diff in diff_index:
+        diff_and_sc = {
+            'diff': commit._get_decoded_str(diff.diff),
+            'source_code_before': commit._get_decoded_sc_str(diff.a_blob),
+            'source_code': commit._get_decoded_sc_str(diff.b_blob)
+        }
+        change_type = commit._from_change_to_modification_type(diff)
+        modifications.append(CachedModification(diff.a_path, diff.b_path, change_type, diff_and_sc,
+                                                diff.a_blob.hexsha if diff.a_blob else None,
+                                                diff.b_blob.hexsha if diff.b_blob else None, parse_cache))
+    return modifications
+
+
+def get_modifications(commit: Commit, is_mined_file: Callable[[str], bool],
+                      parse_cache: ParseCache = None) -> List[Modification]:
+    """Returns the modifications of the commit (as Commit.modifications) of the files accepted by is_mined_file.
+
+    The modified paths are listed first, so the diffs and the sources are read only for the accepted files,
+    and the commits without accepted files are skipped without reading any diff. With a parse cache, the
+    sources already analyzed are not parsed again.
+    """
+    if len(commit.parents) > 1:
+        return []
+
+    paths = {}
+    for status, old_path, new_path in get_modified_paths(commit.project_path, [commit.hash])[commit.hash]:
+        # as Modification.filename: the name of the new file, or of the old one if it is deleted
+        if is_mined_file(os.path.basename(new_path or old_path)):
+            paths.update((p, None) for p in (old_path, new_path) if p is not None)
+    if not paths:
+        return []
+    paths = list(paths)
+
+    # the same diff as Commit.modifications, limited to the paths
+    options = {}
+    if commit._conf.get('histogram'):
+        options['histogram'] = True
+    if commit._conf.get('skip_whitespaces'):
+        options['w'] = True
+    c_object = commit._c_object
+    if commit.parents:
+        diff_index = c_object.parents[0].diff(c_object, paths=paths, create_patch=True, **options)
+    else:
+        diff_index = c_object.diff(NULL_TREE, paths=paths, create_patch=True, **options)
+    if parse_cache is not None:
+        modifications = parse_diff_with_cache(commit, diff_index, parse_cache)
+    else:
+        modifications = commit._parse_diff(diff_index)
+    return [mod for mod in modifications if is_mined_file(mod.filename)]
@@ -0,0 +1,169 @@
+from bisect import bisect_left, bisect_right
+from difflib import SequenceMatcher
+from heapq import nlargest
+
+SIMILARITY_THRESHOLD = 0.6
+# the ratio is computed only for the pairs of each method with the methods most alike it, by the dice index of
+# their shingles (both ways: for the methods of the first dict and for those of the second one)
+CANDIDATES_PER_METHOD = 3
+SHINGLE_SIZE = 5
+
+
+def _is_junk(c):
+    # ignore spaces and tabs
+    return c in " \t"
+
+
+def _shingles(text):
+    text = text.replace(' ', '').replace('\t', '')
+    return {text[i:i + SHINGLE_SIZE] for i in range(max(1, len(text) - SHINGLE_SIZE + 1))}
+
+
+def _most_alike(pairs_by_method, per_method):
+    """The pairs with the highest dice index of each method (in case of a tie, the first ones)"""
+    for pairs in pairs_by_method.values():
+        yield from (pair for _, pair in nlargest(per_method, pairs, key=lambda p: p[0]))
+
+
+def get_similar_candidates(dict_methods1, dict_methods2, threshold: float = SIMILARITY_THRESHOLD,
+                           per_method: int = CANDIDATES_PER_METHOD):
+    """Returns the similarity of the pairs of methods having at least the threshold.
+
+    The SequenceMatcher ratio is computed only for the pairs of lengths that can reach the threshold (as
+    real_quick_ratio) which are among the per_method pairs of one of the two methods with the most common
+    shingles. A pair with a lower dice index is not compared, even if its ratio is over the threshold.
+    """
+    texts2 = sorted(((len(text2), k2, text2, _shingles(text2)) for k2, text2 in dict_methods2.items()),
+                    key=lambda t: t[0])
+    lengths2 = [t[0] for t in texts2]
+
+    # ratio = 2 * matches / (len1 + len2) and matches <= min(len1, len2)
+    min_factor = threshold / (2.0 - threshold)
+    max_factor = (2.0 - threshold) / threshold if threshold > 0 else float('inf')
+
+    by_method1, by_method2 = {}, {}
+    for k1, text1 in dict_methods1.items():
+        len1 = len(text1)
+        shingles1 = None
+        for len2, k2, text2, shingles2 in texts2[bisect_left(lengths2, len1 * min_factor):
+                                                 bisect_right(lengths2, len1 * max_factor)]:
+            if shingles1 is None:
+                shingles1 = _shingles(text1)
+            dice = 2.0 * len(shingles1 & shingles2) / (len(shingles1) + len(shingles2))
+            by_method1.setdefault(k1, []).append((dice, (k1, k2)))
+            by_method2.setdefault(k2, []).append((dice, (k1, k2)))
+    compared = {}
+    for k1, k2 in set(_most_alike(by_method1, per_method)).union(_most_alike(by_method2, per_method)):
+        compared.setdefault(k1, []).append(k2)
+
+    order2 = {k2: i for i, k2 in enumerate(dict_methods2)}
+    candidates = {}
+    for k1, text1 in dict_methods1.items():
+        sm = None
+        for k2 in sorted(compared.get(k1, []), key=order2.get):
+            text2 = dict_methods2[k2]
+            if not text1 and not text2:
+                candidates[(k1, k2)] = 1.0
+                continue
+            if sm is None:
+                sm = SequenceMatcher(isjunk=_is_junk)
+                sm.set_seq2(text1)
+            sm.set_seq1(text2)
+            sim = sm.ratio()
+            if sim >= threshold:
+                candidates[(k1, k2)] = sim
+    return candidates
+
+
+def _min_cost_assignment(cost):
+    """Hungarian algorithm for a n x m cost matrix with n <= m; returns the column assigned to each row"""
+    n, m = len(cost), len(cost[0])
+    inf = float('inf')
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        min_v = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = cost[i0 - 1][j - 1] - u[i0] - v[j]
+                    if cur < min_v[j]:
+                        min_v[j] = cur
+                        way[j] = j0
+                    if min_v[j] < delta:
+                        delta = min_v[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_v[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+    return {p[j] - 1: j - 1 for j in range(1, m + 1) if p[j] != 0}
+
+
+def _components(candidates):
+    """Splits the bipartite graph of candidate pairs in connected components"""
+    neighbours = {}
+    for k1, k2 in candidates:
+        neighbours.setdefault((1, k1), []).append((2, k2))
+        neighbours.setdefault((2, k2), []).append((1, k1))
+
+    seen = set()
+    for node in neighbours:
+        if node in seen:
+            continue
+        seen.add(node)
+        stack = [node]
+        side1, side2 = [], []
+        while stack:
+            side, key = stack.pop()
+            (side1 if side == 1 else side2).append(key)
+            for n in neighbours[(side, key)]:
+                if n not in seen:
+                    seen.add(n)
+                    stack.append(n)
+        yield side1, side2
+
+
+def get_pairs_of_similar_methods(dict_methods1, dict_methods2, threshold: float = SIMILARITY_THRESHOLD):
+    """Pairs the methods of the two dicts (name -> content text) such that the total similarity is maximal.
+
+    Only the pairs with a similarity of at least the threshold are considered. The pairs are returned in the
+    order of the first dict.
+    """
+    candidates = get_similar_candidates(dict_methods1, dict_methods2, threshold)
+
+    pairs = []
+    for keys1, keys2 in _components(candidates):
+        if len(keys1) == 1 and len(keys2) == 1:
+            pairs.append((keys1[0], keys2[0]))
+            continue
+        transpose = len(keys1) > len(keys2)
+        rows, cols = (keys2, keys1) if transpose else (keys1, keys2)
+        cost = [[-candidates.get((c, r) if transpose else (r, c), 0.0) for c in cols] for r in rows]
+        for r, c in _min_cost_assignment(cost).items():
+            if cost[r][c] < 0:
+                pairs.append((cols[c], rows[r]) if transpose else (rows[r], cols[c]))
+
+    order = {k: i for i, k in enumerate(dict_methods1)}
+    pairs.sort(key=lambda pair: order[pair[0]])
+    return pairs
@@ -0,0 +1,66 @@
+from pydriller.domain.commit import Method
+
+from utils.helpers import split_method_long_name
+
+
+def get_method_content(source_code_lines):
+    # trim whitespaces
+    source_code_lines = [line.strip(' \t\n') for line in source_code_lines]
+    cnt_start = 0
+    for i in range(len(source_code_lines)):
+        if '{' in source_code_lines[i]:
+            cnt_start = i
+            break
+    return source_code_lines[cnt_start:]
+
+
+class SourceLines:
+    """The lines of a source code, split once, and the contents of its methods, computed once per method"""
+    __slots__ = ('lines', '_texts', '_contents')
+
+    def __init__(self, source_code: str):
+        self.lines = source_code.splitlines() if source_code else []
+        self._texts = {}
+        self._contents = {}
+
+    def method_text(self, method: Method) -> str:
+        """The signature (name + parameters) followed by the lines of the method, as compared for the similarity"""
+        # the same long name can be declared twice in a file (e.g. under #if), each has its own lines
+        key = (method.long_name, method.start_line, method.end_line)
+        text = self._texts.get(key)
+        if text is None:
+            sig, _ = split_method_long_name(method.long_name)
+            text = sig + ''.join(self.lines[method.start_line: method.end_line])
+            self._texts[key] = text
+        return text
+
+    def method_content(self, method: Method):
+        """The trimmed lines of the method body, as compared for the changed lines"""
+        key = (method.start_line, method.end_line)
+        content = self._contents.get(key)
+        if content is None:
+            content = get_method_content(self.lines[method.start_line: method.end_line])
+            self._contents[key] = content
+        return content
+
+
+class ModificationLines:
+    """The source lines before and after a modification"""
+    __slots__ = ('modification', '_before', '_current')
+
+    def __init__(self, modification):
+        self.modification = modification
+        self._before = None
+        self._current = None
+
+    @property
+    def before(self) -> SourceLines:
+        if self._before is None:
+            self._before = SourceLines(self.modification.source_code_before)
+        return self._before
+
+    @property
+    def current(self) -> SourceLines:
+        if self._current is None:
+            self._current = SourceLines(self.modification.source_code)
+        return self._current
@@ -0,0 +1,273 @@
+"""
+Mining state kept in a SQLite database instead of memory, for histories too large for the RAM.
+
+The files, the removed methods and the commits are used as the dict/list of main. The files modified by the
+current commit are kept in memory and written with the commits and removed methods in one transaction per
+commit (flush), so the database always holds the state after a mined commit.
+"""
+
+import sqlite3
+from collections.abc import MutableMapping
+from datetime import datetime
+
+from pydriller.domain.developer import Developer
+
+from utils.change import ChangedFile, ChangedMethod, Commit
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS commits (idx INTEGER PRIMARY KEY, hash TEXT, date TEXT, author_name TEXT,
+                                    author_email TEXT, msg TEXT);
+CREATE TABLE IF NOT EXISTS files (id INTEGER PRIMARY KEY, path TEXT UNIQUE, filename TEXT, position INTEGER);
+CREATE INDEX IF NOT EXISTS files_position ON files (position);
+CREATE TABLE IF NOT EXISTS methods (file_id INTEGER, position INTEGER, name TEXT, class_path TEXT,
+                                    previous_long_name TEXT, changes BLOB);
+CREATE INDEX IF NOT EXISTS methods_file ON methods (file_id, position);
+CREATE TABLE IF NOT EXISTS removed (id INTEGER PRIMARY KEY, commit_idx INTEGER, list_no INTEGER, name TEXT,
+                                    class_path TEXT, previous_long_name TEXT, changes BLOB);
+CREATE INDEX IF NOT EXISTS removed_commit ON removed (commit_idx, list_no);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+'''
+
+
+def _method_row(m: ChangedMethod):
+    return m.name, m.class_path, m.previous_long_name, m.changes.tobytes()
+
+
+def _method_from_row(name, class_path, previous_long_name, changes) -> ChangedMethod:
+    m = ChangedMethod(name, class_path)
+    m.previous_long_name = previous_long_name
+    m.changes.frombytes(changes)
+    return m
+
+
+class StoredCommits:
+    """The mined commits, by index; the new ones are written on flush"""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._stored = connection.execute('SELECT COUNT(*) FROM commits').fetchone()[0]
+        self._pending = []
+
+    @staticmethod
+    def _from_row(idx, c_hash, date, author_name, author_email, msg) -> Commit:
+        return Commit(idx, datetime.fromisoformat(date), Developer(author_name, author_email), msg, c_hash)
+
+    def __len__(self):
+        return self._stored + len(self._pending)
+
+    def __getitem__(self, index: int) -> Commit:
+        if index >= self._stored:
+            return self._pending[index - self._stored]
+        row = self._connection.execute('SELECT * FROM commits WHERE idx = ?', (index,)).fetchone()
+        if row is None:
+            raise IndexError(index)
+        return self._from_row(*row)
+
+    def __iter__(self):
+        self.flush()
+        for row in self._connection.execute('SELECT * FROM commits ORDER BY idx'):
+            yield self._from_row(*row)
+
+    def append(self, commit: Commit):
+        self._pending.append(commit)
+
+    def extend(self, commits):
+        for c in commits:
+            self.append(c)
+
+    def clear(self):
+        self._connection.execute('DELETE FROM commits')
+        self._stored = 0
+        self._pending = []
+
+    def flush(self):
+        self._connection.executemany('INSERT INTO commits VALUES (?, ?, ?, ?, ?, ?)', [
+            (c.index, c.commit_hash, c.date.isoformat(), c.author.name, c.author.email, c.msg)
+            for c in self._pending])
+        self._stored += len(self._pending)
+        self._pending = []
+
+
+class StoredFiles(MutableMapping):
+    """The files by path, in the order they were added; the files used since the last flush are kept in memory
+    and written back on flush, as their methods can be changed in place"""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._loaded = {}
+        self._position = connection.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM files').fetchone()[0]
+
+    def _file_id(self, path: str):
+        row = self._connection.execute('SELECT id FROM files WHERE path = ?', (path,)).fetchone()
+        return row[0] if row is not None else None
+
+    def __contains__(self, path):
+        return path in self._loaded or self._file_id(path) is not None
+
+    def __getitem__(self, path: str) -> ChangedFile:
+        if path in self._loaded:
+            return self._loaded[path]
+        row = self._connection.execute('SELECT id, filename FROM files WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            raise KeyError(path)
+        c_file = ChangedFile(row[1], path)
+        for method_row in self._connection.execute('SELECT name, class_path, previous_long_name, changes '
+                                                   'FROM methods WHERE file_id = ? ORDER BY position', (row[0],)):
+            c_file.add_method(_method_from_row(*method_row))
+        self._loaded[path] = c_file
+        return c_file
+
+    def __setitem__(self, path: str, c_file: ChangedFile):
+        if self._file_id(path) is None:
+            self._connection.execute('INSERT INTO files (path, filename, position) VALUES (?, ?, ?)',
+                                     (path, c_file.filename, self._position))
+            self._position += 1
+        self._loaded[path] = c_file
+
+    def __delitem__(self, path: str):
+        file_id = self._file_id(path)
+        if file_id is None:
+            raise KeyError(path)
+        self._loaded.pop(path, None)
+        self._connection.execute('DELETE FROM methods WHERE file_id = ?', (file_id,))
+        self._connection.execute('DELETE FROM files WHERE id = ?', (file_id,))
+
+    def __len__(self):
+        return self._connection.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def __iter__(self):
+        for row in self._connection.execute('SELECT path FROM files ORDER BY position'):
+            yield row[0]
+
+    def items(self):
+        """Streams the files in order; they are not kept in memory, so their changes are not saved"""
+        self.flush()
+        c_file = None
+        for path, filename, *method_row in self._connection.execute(
+                'SELECT f.path, f.filename, m.name, m.class_path, m.previous_long_name, m.changes FROM files f '
+                'LEFT JOIN methods m ON m.file_id = f.id ORDER BY f.position, m.position'):
+            if c_file is None or c_file.full_path != path:
+                if c_file is not None:
+                    yield c_file.full_path, c_file
+                c_file = ChangedFile(filename, path)
+            if method_row[0] is not None:
+                c_file.add_method(_method_from_row(*method_row))
+        if c_file is not None:
+            yield c_file.full_path, c_file
+
+    def values(self):
+        return (c_file for _, c_file in self.items())
+
+    def clear(self):
+        self._loaded = {}
+        self._connection.execute('DELETE FROM methods')
+        self._connection.execute('DELETE FROM files')
+
+    def reset_changes(self):
+        """Removes the changes of all the methods and saves their current long name as previous name"""
+        self.flush()
+        self._connection.execute("UPDATE methods SET previous_long_name = class_path || name, changes = x''")
+
+    def flush(self):
+        for path, c_file in self._loaded.items():
+            file_id = self._file_id(path)
+            self._connection.execute('UPDATE files SET filename = ? WHERE id = ?', (c_file.filename, file_id))
+            self._connection.execute('DELETE FROM methods WHERE file_id = ?', (file_id,))
+            self._connection.executemany('INSERT INTO methods VALUES (?, ?, ?, ?, ?, ?)', [
+                (file_id, position) + _method_row(m) for position, m in enumerate(c_file.methods)])
+        self._loaded = {}
+
+
+class _StoredMethodLists:
+    """The lists of removed methods of a commit, as appended by main.add_to_trash"""
+
+    def __init__(self, trash, commit: Commit):
+        self._trash = trash
+        self._commit = commit
+
+    def append(self, methods):
+        self._trash.add(self._commit, methods)
+
+    def extend(self, methods_lists):
+        for methods in methods_lists:
+            self.append(methods)
+
+
+class StoredTrash:
+    """The removed methods by commit (as the dict commit -> list of lists of methods), written when added"""
+
+    def __init__(self, connection, commits: StoredCommits):
+        self._connection = connection
+        self._commits = commits
+        self._list_numbers = dict(connection.execute('SELECT commit_idx, MAX(list_no) + 1 FROM removed '
+                                                     'GROUP BY commit_idx'))
+
+    def __contains__(self, commit: Commit):
+        return commit.index in self._list_numbers
+
+    def __getitem__(self, commit: Commit):
+        if commit not in self:
+            raise KeyError(commit.commit_hash)
+        return _StoredMethodLists(self, commit)
+
+    def __setitem__(self, commit: Commit, methods_lists):
+        self._connection.execute('DELETE FROM removed WHERE commit_idx = ?', (commit.index,))
+        self._list_numbers[commit.index] = 0
+        for methods in methods_lists:
+            self.add(commit, methods)
+
+    def add(self, commit: Commit, methods):
+        list_no = self._list_numbers.get(commit.index, 0)
+        self._list_numbers[commit.index] = list_no + 1
+        self._connection.executemany('INSERT INTO removed (commit_idx, list_no, name, class_path, '
+                                     'previous_long_name, changes) VALUES (?, ?, ?, ?, ?, ?)',
+                                     [(commit.index, list_no) + _method_row(m) for m in methods])
+
+    def __len__(self):
+        return len(self._list_numbers)
+
+    def items(self):
+        """Streams (commit, lists of removed methods) in the order of the commits"""
+        for commit_idx in sorted(self._list_numbers):
+            methods_lists = [[] for _ in range(self._list_numbers[commit_idx])]
+            for list_no, *method_row in self._connection.execute(
+                    'SELECT list_no, name, class_path, previous_long_name, changes FROM removed '
+                    'WHERE commit_idx = ? ORDER BY list_no, id', (commit_idx,)):
+                methods_lists[list_no].append(_method_from_row(*method_row))
+            yield self._commits[commit_idx], methods_lists
+
+    def update(self, trash):
+        for commit, methods_lists in trash.items():
+            self[commit] = methods_lists
+
+    def clear(self):
+        self._connection.execute('DELETE FROM removed')
+        self._list_numbers = {}
+
+
+class MiningStore:
+    """The state of the mining in a SQLite database; an existing database is continued"""
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+        self.commits = StoredCommits(self.connection)
+        self.files = StoredFiles(self.connection)
+        self.trash = StoredTrash(self.connection, self.commits)
+
+    @property
+    def last_commit(self):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'last_commit'").fetchone()
+        return row[0] if row is not None else None
+
+    def flush(self, last_commit: str = None):
+        """Writes the state in one transaction; last_commit is the hash of the last mined commit"""
+        self.commits.flush()
+        self.files.flush()
+        if last_commit is not None:
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('last_commit', ?)", (last_commit,))
+        self.connection.commit()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
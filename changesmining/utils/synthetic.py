@@ -0,0 +1,175 @@
+"""
+Generates local git repositories of C# files with random changes, to benchmark the mining.
+"""
+
+import os
+import random
+import subprocess
+
+_PARAMETERS = ['', 'int a', 'string s, int b', 'long z', 'bool q', 'int a, int c']
+
+
+def _git(args, path, env=None):
+    subprocess.run(['git'] + args, cwd=path, env=env, check=True, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+
+
+def _render(c_file) -> str:
+    lines = ['using System;', '', 'namespace ' + c_file['namespace'], '{',
+             '    public class ' + c_file['class'], '    {']
+    for m in c_file['methods']:
+        lines += ['        public int {}({})'.format(m['name'], m['parameters']), '        {']
+        lines += ['            ' + line for line in m['body']]
+        lines += ['            return 0;', '        }', '']
+    lines += ['    }', '}', '']
+    return '\n'.join(lines)
+
+
+class SyntheticRepository:
+    """A repository of nr_files C# files with methods_per_file methods (on average), changed by nr_commits commits.
+
+    Each commit changes a few files; the shares are the probabilities that a change is a rename (of a method,
+    class or file), a move (of a method to another file, or of a class to another namespace) or a large
+    refactor (most methods of a file renamed and edited). The other changes edit, add or remove methods.
+    """
+
+    def __init__(self, path: str, nr_commits: int = 100, nr_files: int = 10, methods_per_file: int = 8,
+                 rename_share: float = 0.1, move_share: float = 0.05, refactor_share: float = 0.02,
+                 seed: int = 1):
+        self.path = path
+        self.nr_commits = nr_commits
+        self.nr_files = nr_files
+        self.methods_per_file = methods_per_file
+        self.rename_share = rename_share
+        self.move_share = move_share
+        self.refactor_share = refactor_share
+        self.rng = random.Random(seed)
+        self.files = {}
+        self.counter = 0
+
+    def _next_id(self) -> int:
+        self.counter += 1
+        return self.counter
+
+    def _line(self) -> str:
+        if self.rng.random() < 0.2:
+            return '// {}'.format(self.rng.randint(0, 999))
+        return 'var x{} = Compute(y{}, "{}");'.format(self.rng.randint(0, 99), self.rng.randint(0, 9),
+                                                   ''.join(self.rng.choice('abcdefgh') for _ in range(8)))
+
+    def _method(self):
+        return {'name': 'Method{}'.format(self._next_id()), 'parameters': self.rng.choice(_PARAMETERS),
+                'body': [self._line() for _ in range(self.rng.randint(2, 15))]}
+
+    def _add_file(self):
+        file_id = self._next_id()
+        nr_methods = max(1, int(self.rng.gauss(self.methods_per_file, self.methods_per_file / 4)))
+        self.files['src/Dir{}/File{}.cs'.format(file_id % 5, file_id)] = {
+            'namespace': 'Ns{}'.format(self.rng.randint(0, 3)), 'class': 'Class{}'.format(file_id),
+            'methods': [self._method() for _ in range(nr_methods)]}
+
+    def _is_written(self, path) -> bool:
+        """False for a file added by the commit being generated: it is written (and added to git) at its end"""
+        return os.path.exists(os.path.join(self.path, path))
+
+    def _edit(self, m):
+        for _ in range(self.rng.randint(1, 3)):
+            i = self.rng.randint(0, len(m['body']))
+            if self.rng.random() < 0.5 and m['body']:
+                m['body'][min(i, len(m['body']) - 1)] = self._line()
+            else:
+                m['body'].insert(i, self._line())
+
+    def _rename(self, path, changed):
+        c_file = self.files[path]
+        kind = self.rng.random()
+        if kind < 0.6 and c_file['methods']:
+            self.rng.choice(c_file['methods'])['name'] = 'Renamed{}'.format(self._next_id())
+        elif kind < 0.8:
+            c_file['class'] = 'Class{}'.format(self._next_id())
+        else:
+            new_path = 'src/Dir{}/File{}.cs'.format(self.rng.randint(0, 4), self._next_id())
+            if self._is_written(path):
+                os.makedirs(os.path.dirname(os.path.join(self.path, new_path)), exist_ok=True)
+                _git(['mv', path, new_path], self.path)
+            self.files[new_path] = self.files.pop(path)
+            changed.discard(path)
+            path = new_path
+        changed.add(path)
+
+    def _move(self, path, changed):
+        c_file = self.files[path]
+        others = [p for p in self.files if p != path]
+        if self.rng.random() < 0.7 and others and c_file['methods']:
+            other = self.rng.choice(others)
+            self.files[other]['methods'].append(c_file['methods'].pop(self.rng.randrange(len(c_file['methods']))))
+            changed.add(other)
+        else:
+            c_file['namespace'] = 'Other{}'.format(self.rng.randint(0, 5))
+        changed.add(path)
+
+    def _refactor(self, path, changed):
+        for m in self.files[path]['methods']:
+            if self.rng.random() < 0.8:
+                m['name'] = 'Refactored{}'.format(self._next_id())
+                self._edit(m)
+        self.rng.shuffle(self.files[path]['methods'])
+        changed.add(path)
+
+    def _change(self, path, changed):
+        c_file = self.files[path]
+        kind = self.rng.random()
+        if kind < 0.6 and c_file['methods']:
+            self._edit(self.rng.choice(c_file['methods']))
+        elif kind < 0.8:
+            c_file['methods'].insert(self.rng.randint(0, len(c_file['methods'])), self._method())
+        elif kind < 0.9 and len(c_file['methods']) > 1:
+            c_file['methods'].pop(self.rng.randrange(len(c_file['methods'])))
+        elif kind < 0.95 and len(self.files) > 2:
+            if self._is_written(path):
+                _git(['rm', '-q', '-f', path], self.path)
+            del self.files[path]
+            changed.discard(path)
+            return
+        else:
+            self._add_file()
+            changed.update(p for p in self.files if not os.path.exists(os.path.join(self.path, p)))
+        changed.add(path)
+
+    def generate(self) -> str:
+        """Creates the repository (its folder must not exist) and returns its path"""
+        os.makedirs(self.path)
+        _git(['init', '-q'], self.path)
+        for _ in range(self.nr_files):
+            self._add_file()
+        changed = set(self.files)
+
+        date = 1600000000
+        for i in range(self.nr_commits):
+            if i > 0:
+                for _ in range(self.rng.randint(1, 3)):
+                    path = self.rng.choice(sorted(self.files))
+                    kind = self.rng.random()
+                    if kind < self.rename_share:
+                        self._rename(path, changed)
+                    elif kind < self.rename_share + self.move_share:
+                        self._move(path, changed)
+                    elif kind < self.rename_share + self.move_share + self.refactor_share:
+                        self._refactor(path, changed)
+                    else:
+                        self._change(path, changed)
+            for path in changed:
+                full_path = os.path.join(self.path, path)
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                with open(full_path, 'w') as f:
+                    f.write(_render(self.files[path]))
+            changed = set()
+
+            date += 3600
+            author = 'dev{}'.format(self.rng.randint(0, 4))
+            env = dict(os.environ, GIT_AUTHOR_DATE='{} +0000'.format(date), GIT_COMMITTER_DATE='{} +0000'.format(date),
+                       GIT_AUTHOR_NAME=author, GIT_AUTHOR_EMAIL=author + '@mail', GIT_COMMITTER_NAME=author,
+                       GIT_COMMITTER_EMAIL=author + '@mail')
+            _git(['add', '-A'], self.path)
+            _git(['commit', '-q', '--allow-empty', '-m', 'commit {}'.format(i)], self.path, env)
+        return self.path
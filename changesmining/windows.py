@@ -0,0 +1,150 @@
+"""
+Module to compute the changes of the methods in date or commit windows from a mined state (a checkpoint or a
+store), without mining the repository again.
+
+The methods keep the index of each commit changing them and its changed lines; a window selects commits by
+their date (since <= date < until) or by their position between two commits (both included).
+
+Example:
+    python windows.py state.pkl.gz changes.csv --window v1=2020-01-01..2020-06-01 --window v2=2020-06-01..
+"""
+
+import argparse
+import csv
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from utils.helpers import load_checkpoint
+from utils.store import MiningStore
+
+_hash_pattern = re.compile(r'^[0-9a-f]{7,40}$')
+
+
+def load_mining_state(path: str):
+    """Returns the files and the mined commits saved in a store (.db) or a checkpoint"""
+    if not os.path.isfile(path):
+        # sqlite would create an empty store
+        raise FileNotFoundError('No mining state in {}'.format(path))
+    if path.endswith('.db'):
+        store = MiningStore(path)
+        return store.files, store.commits
+    files, _, commits, _ = load_checkpoint(path)
+    return files, commits
+
+
+def _is_commit(value: str) -> bool:
+    """A commit hash, unless it is a date too (as 20200101)"""
+    if not _hash_pattern.match(value):
+        return False
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return True
+    return False
+
+
+def _as_datetime(value, commit_date: datetime) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        # a date without timezone is compared with the local time of the commit
+        return value.replace(tzinfo=commit_date.tzinfo)
+    return value
+
+
+def _find_commit(commits_by_hash: Dict[str, int], commit_hash: str) -> int:
+    if commit_hash in commits_by_hash:
+        return commits_by_hash[commit_hash]
+    matches = [i for h, i in commits_by_hash.items() if h.startswith(commit_hash)]
+    if len(matches) != 1:
+        raise ValueError('Commit {} matches {} mined commits'.format(commit_hash, len(matches)))
+    return matches[0]
+
+
+def select_commits(commits, since=None, until=None, from_commit: str = None, to_commit: str = None) -> bytearray:
+    """Returns for each commit index 1 if the commit is in the window, else 0"""
+    commits = list(commits)
+    selected = bytearray(len(commits))
+    commits_by_hash = {}
+    for c in commits:
+        commits_by_hash.setdefault(c.commit_hash, c.index)
+    first = _find_commit(commits_by_hash, from_commit) if from_commit is not None else 0
+    last = _find_commit(commits_by_hash, to_commit) if to_commit is not None else len(commits) - 1
+
+    for c in commits:
+        if not first <= c.index <= last:
+            continue
+        if since is not None and c.date < _as_datetime(since, c.date):
+            continue
+        if until is not None and c.date >= _as_datetime(until, c.date):
+            continue
+        selected[c.index] = 1
+    return selected
+
+
+def parse_window(window: str) -> Tuple[str, dict]:
+    """Parses NAME=START..END, where START and END are dates or commit hashes and can be empty"""
+    name, _, bounds = window.partition('=')
+    start, sep, end = bounds.partition('..')
+    if not name or not sep:
+        raise ValueError('Invalid window {}, expected NAME=START..END'.format(window))
+    bounds = {}
+    for value, date_key, commit_key in [(start, 'since', 'from_commit'), (end, 'until', 'to_commit')]:
+        if value:
+            bounds[commit_key if _is_commit(value) else date_key] = value
+    return name, bounds
+
+
+def get_window_metrics(files, selections: List[bytearray]):
+    """Yields for each method its file, its name and the number of changes and changed lines in each window"""
+    # the windows of each commit
+    commit_windows = [[i for i, selected in enumerate(selections) if selected[commit_index]]
+                      for commit_index in range(len(selections[0]) if selections else 0)]
+    for v_f in files.values():
+        for mp in v_f.methods:
+            metrics = [0] * (2 * len(selections))
+            for commit_index, changed_lines in mp.iter_changes():
+                for i in commit_windows[commit_index]:
+                    metrics[2 * i] += 1
+                    metrics[2 * i + 1] += changed_lines
+            yield [v_f.full_path, v_f.filename, mp.class_path + mp.name] + metrics
+
+
+def write_windows_csv(files, commits, windows: Dict[str, dict], file_path: str):
+    """Writes the changes of the methods in each window (name -> select_commits arguments) in one pass.
+
+    With a single window named '' the columns are those of write_to_csv.
+    """
+    selections = [select_commits(commits, **bounds) for bounds in windows.values()]
+    with open(file_path, 'w') as csvfile:
+        fieldnames = ['Full_path', 'Filename', 'Method']
+        for name in windows:
+            fieldnames += ['Changes', 'ChgLines'] if name == '' else ['Changes_' + name, 'ChgLines_' + name]
+        file_writer = csv.writer(csvfile, delimiter=';', lineterminator='\n')
+        file_writer.writerow(fieldnames)
+        for row in get_window_metrics(files, selections):
+            file_writer.writerow(row)
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Changes of the methods in date or commit windows')
+    parser.add_argument('state', help='checkpoint or store (.db) of a mining')
+    parser.add_argument('output', help='csv file')
+    parser.add_argument('--window', action='append', default=[], help='NAME=START..END (dates or commit hashes)')
+    parser.add_argument('--since', help='first date of a single window')
+    parser.add_argument('--until', help='date after the single window')
+    parser.add_argument('--from-commit', help='first commit of a single window')
+    parser.add_argument('--to-commit', help='last commit of a single window')
+    args = parser.parse_args()
+
+    if args.window:
+        use_windows = dict(parse_window(w) for w in args.window)
+    else:
+        use_windows = {'': {'since': args.since, 'until': args.until,
+                            'from_commit': args.from_commit, 'to_commit': args.to_commit}}
+
+    mined_files, mined_commits = load_mining_state(args.state)
+    write_windows_csv(mined_files, mined_commits, use_windows, args.output)
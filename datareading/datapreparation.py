@@ -11,7 +11,7 @@ import numpy as np
 import os
 
 from transformscripts import change_method_name_metrics, ctor_to_class_name, change_method_name_commits, \
-    get_profiler_metrics_data, collect_test_coverage_data, change_name_coverage, remove_generics
+    get_profiler_metrics_data, collect_test_coverage_data, change_name_coverage, remove_generics, normalize_unique
 
 # Resource path locations
 
@@ -36,7 +36,7 @@ def prepare_source_code_metrics():
     and filters the out of scope methods"""
 
     metrics_data = pd.read_csv(SOURCE_CODE_METRICS_FILE, sep=';', decimal=',')
-    metrics_data['FullName'] = metrics_data['FullName'].apply(change_method_name_metrics)
+    metrics_data['FullName'] = normalize_unique(metrics_data['FullName'], change_method_name_metrics)
 
     metrics_data["NbLinesOfCode"].replace({0: np.nan}, inplace=True)
 
@@ -56,7 +56,7 @@ def prepare_source_code_metrics():
 
     # Constructors are listed as 'ctor' or 'cctor',
     # replace these with the class name (the actual name of the constructor)
-    sc_metrics_data['Method'] = sc_metrics_data['Method'].apply(ctor_to_class_name)
+    sc_metrics_data['Method'] = normalize_unique(sc_metrics_data['Method'], ctor_to_class_name)
 
     # ..ctor and ..cctor might result in the same method;
     # however the source doesn't have all the constructors find by the Ndepend
@@ -70,7 +70,7 @@ def prepare_source_code_metrics():
 def get_change_metrics(file):
     """Reads and modifies the repository mining report"""
     data = pd.read_csv(file, sep=';')
-    data['Method_Parsed'] = data['Method'].apply(change_method_name_commits)
+    data['Method_Parsed'] = normalize_unique(data['Method'], change_method_name_commits)
     return data
 
 
@@ -83,7 +83,7 @@ def prepare_changed_lines_data():
     """Change metrics report preparation for validation"""
     if REPO_MINING_FILE_FOR_CHGLINES is not None:
         data = get_change_metrics(REPO_MINING_FILE_FOR_CHGLINES)
-        data['Previous_Method_Parsed'] = data['Previous_name'].apply(change_method_name_commits)
+        data['Previous_Method_Parsed'] = normalize_unique(data['Previous_name'], change_method_name_commits)
         data = data[['Method_Parsed', 'Previous_Method_Parsed', 'ChgLines']]
 
         return data
@@ -109,7 +109,7 @@ def get_all_profiler_metrics_data(folder):
 def prepare_usage_metrics():
     """Usage metrics report preparation"""
     data = get_all_profiler_metrics_data(USAGE_DATA_FOLDER)
-    data['Method'] = data['Method'].apply(ctor_to_class_name)
+    data['Method'] = normalize_unique(data['Method'], ctor_to_class_name)
     return data
 
 
@@ -119,7 +119,7 @@ def prepare_test_coverage():
     """Test coverage report preparation"""
     if TEST_COVERAGE_FILE is not None:
         data = collect_test_coverage_data(TEST_COVERAGE_FILE)
-        data['Method'] = data['Method'].apply(change_name_coverage)
+        data['Method'] = normalize_unique(data['Method'], change_name_coverage)
         return data
 
     return None
@@ -160,8 +160,16 @@ if __name__ == "__main__":
     # Merge change data to source code metrics data
     merged = pd.merge(left=sc_metrics_data, right=sub_change_data, how='left', on='Method')
 
+    # Merge the author and ownership metrics, if the repository mining report has them
+    if 'Authors' in change_data.columns:
+        sub_ownership_data = change_data[['Method_Parsed', 'Authors', 'Days_since_change', 'Recent_ChgLines']]
+        sub_ownership_data.columns = ['Method', 'NAuth', 'DaysSinceChg', 'RecentChgLines']
+        sub_ownership_data = sub_ownership_data.groupby('Method').agg(
+            {'NAuth': 'max', 'DaysSinceChg': 'min', 'RecentChgLines': 'sum'}).reset_index()
+        merged = pd.merge(left=merged, right=sub_ownership_data, how='left', on='Method')
+
     # Remove the generic types of the parameters
-    merged['Method_Parsed'] = merged['Method'].apply(remove_generics)
+    merged['Method_Parsed'] = normalize_unique(merged['Method'], remove_generics)
 
     # Select the required variables from usage metrics report
     sub_usage_data = usage_data[['Method', 'Calls']]
@@ -1,8 +1,13 @@
+import os
+import tempfile
+import tracemalloc
 import unittest
+import numpy as np
 import pandas as pd
 
 from transformscripts import change_method_name_metrics, ctor_to_class_name, change_method_name_commits, \
-    change_method_name_usage, change_name_coverage, remove_generics
+    change_method_name_usage, change_name_coverage, remove_generics, replace_by_token, normalize_unique, \
+    get_profiler_metrics_data
 
 
 class MyTestCase(unittest.TestCase):
@@ -104,6 +109,69 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual("abc(List)", df['Generics'][5])
         self.assertEqual("abc(List,String)", df['Generics'][6])
 
+    def test_replace_by_token(self):
+        self.assertEqual("Func<T,Object>[]", replace_by_token("System.Func<T,object>[]", True, True))
+        self.assertEqual("(,Int32)", replace_by_token("(,int)", False, True))
+        self.assertEqual("(a.b.int)", replace_by_token("(a.b.int)", False, True))
+        self.assertEqual("", replace_by_token("", True, True))
+
+    def test_normalize_unique(self):
+        s = pd.Series(["A::B( int a)", np.nan, "A::C( string s)", "A::B( int a)", np.nan], index=[5, 4, 3, 2, 1])
+
+        result = normalize_unique(s, change_method_name_commits)
+
+        self.assertTrue(s.apply(change_method_name_commits).equals(result))
+        self.assertEqual(["A.B(Int32)", "A.C(String)", "A.B(Int32)"], result.dropna().tolist())
+        self.assertTrue(normalize_unique(pd.Series([], dtype=object), remove_generics).empty)
+
+    def test_profiler_metrics_data(self):
+        xml = ('<Root>'
+               '<Function FQN="Ns.A`1.Get(out int, ref string)" Calls="3"><Function FQN="Ns.A.Inner()" Calls="7"/>'
+               '</Function>'
+               '<Function FQN="Ns.A.Set+Inner()" Calls="2"/>'
+               '<Other><Function FQN="Ns.B()" Calls="1"/></Other>'
+               '<Function FQN="Ns.A.Set+Inner()" Calls="4"/>'
+               '</Root>')
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            file = os.path.join(tmp_folder, 'profiler.xml')
+            with open(file, 'w') as f:
+                f.write(xml)
+
+            df = get_profiler_metrics_data(file)
+
+        self.assertEqual(["Ns.A.Get(int,string)", "Ns.A.Set.Inner()"], df['Method'].tolist())
+        self.assertEqual([3, 6], df['Calls'].tolist())
+
+    @staticmethod
+    def write_nested_profiler_file(file, nr_calls):
+        # a call tree of nr_calls functions (called functions, with their own calls) under each top level function
+        with open(file, 'w') as f:
+            f.write('<Root>')
+            for i in range(2):
+                f.write('<Function FQN="Ns.A.Get()" Calls="1">')
+                for j in range(nr_calls // 5):
+                    f.write('<Function FQN="Ns.B.Call{}()" Calls="2">'.format(j))
+                    f.write('<Function FQN="Ns.C.Inner()" Calls="2">' * 4 + '</Function>' * 4)
+                    f.write('</Function>')
+                f.write('</Function>')
+            f.write('</Root>')
+
+    def test_profiler_metrics_data_memory(self):
+        peaks = []
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            for nr_calls in [5000, 40000]:
+                file = os.path.join(tmp_folder, 'profiler-{}.xml'.format(nr_calls))
+                self.write_nested_profiler_file(file, nr_calls)
+                tracemalloc.start()
+                df = get_profiler_metrics_data(file)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+                self.assertEqual(['Ns.A.Get()'], df['Method'].tolist())
+                self.assertEqual([2], df['Calls'].tolist())
+
+        # the nested functions are freed as they are read: 8 times the calls, not 8 times the memory
+        self.assertLess(peaks[1], 2 * peaks[0])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,8 @@
 """ Scripts to modify the method signatures from the data collection reports. """
 
+from functools import lru_cache
 from xml.etree import ElementTree
+import re
 import pandas as pd
 import numpy as np
 
@@ -16,6 +18,7 @@ def get_type_outbox(param_type):
     return param_type
 
 
+@lru_cache(maxsize=4096)
 def handle_token(token, remove_parentclass, replace_type):
     if remove_parentclass:
         token = token[token.rfind(".") + 1:]
@@ -24,21 +27,15 @@ def handle_token(token, remove_parentclass, replace_type):
     return token
 
 
+# the delimiters of the type names; split keeps them at the odd positions
+_type_delims = re.compile(r'([<>,\[\]()])')
+
+
 def replace_by_token(param_type, remove_parentclass, replace_type):
-    delims = "<>,[]()"
-    token = ''
-    new_param_type = ''
-    for i in range(len(param_type)):
-        if param_type[i] in delims:
-            replace = handle_token(token, remove_parentclass, replace_type)
-            token = ''
-            new_param_type += replace + param_type[i]
-        else:
-            token = token + param_type[i]
-            if i == len(param_type) - 1:
-                replace = handle_token(token, remove_parentclass, replace_type)
-                new_param_type += replace
-    return new_param_type
+    parts = _type_delims.split(param_type)
+    # the parts between delimiters are the tokens
+    parts[0::2] = [handle_token(token, remove_parentclass, replace_type) for token in parts[0::2]]
+    return ''.join(parts)
 
 
 def replace_types(param_type):
@@ -70,23 +67,45 @@ def ctor_to_class_name(value):
 
 
 def remove_generics(params_decl):
-    new_decl = ''
-    count = 0
+    if '<' not in params_decl and '>' not in params_decl:
+        return params_decl.replace('&', '')
 
-    for i in range(len(params_decl)):
-        c = params_decl[i]
+    new_decl = []
+    count = 0
+    for c in params_decl:
         if c == '<':
             count += 1
-            continue
-        if c == '>':
+        elif c == '>':
             count -= 1
-            continue
-        if c == '&':
-            continue
-        if count == 0:
-            new_decl += c
+        elif c != '&' and count == 0:
+            new_decl.append(c)
+
+    return ''.join(new_decl)
+
 
-    return new_decl
+# --------- Normalization of the report columns --------- #
+
+# the normalized values kept per function, for the signatures repeated across reports
+MEMO_SIZE = 100000
+_memoized = {}
+
+
+def normalize_unique(values, function):
+    """Same as values.apply(function), with the function called once per distinct value"""
+    if values.empty:
+        return values.apply(function)
+    if function not in _memoized:
+        _memoized[function] = lru_cache(maxsize=MEMO_SIZE)(function)
+    memoized = _memoized[function]
+
+    codes, uniques = pd.factorize(values)
+    normalized = [memoized(value) for value in uniques]
+    if (codes == -1).any():
+        # the missing values are the last one
+        normalized.append(function(np.nan))
+    result = np.empty(len(normalized), dtype=object)
+    result[:] = normalized
+    return pd.Series(result[codes], index=values.index, name=values.name)
 
 
 # --------- Source code metrics report --------- #
@@ -193,17 +212,29 @@ def change_method_name_usage(method):
 
 
 def get_profiler_metrics_data(file):
-    """Parses the XML file to collect the method signatures"""
-    calls_metrics = {'Method': [], 'Calls': []}
-    root = ElementTree.parse(file).getroot()
-    for type_tag in root.findall('Function'):
-        method = type_tag.get('FQN')
-        calls = type_tag.get('Calls')
+    """Parses the XML file to collect the method signatures and their calls, summed by signature.
+
+    The file is read as a stream: each element under the root, at any depth, is freed once read, whatever the
+    size and the depth of the call trees.
+    """
+    calls_by_method = {}
+    open_elements = []
+    for event, element in ElementTree.iterparse(file, events=('start', 'end')):
+        if event == 'start':
+            if len(open_elements) == 1 and element.tag == 'Function':
+                # the attributes are read with the start tag
+                method = str(element.get('FQN'))
+                calls_by_method[method] = calls_by_method.get(method, 0) + int(element.get('Calls'))
+            open_elements.append(element)
+        else:
+            open_elements.pop()
+            if open_elements:
+                element.clear()
+                open_elements[-1].remove(element)
 
-        calls_metrics['Method'].append(str(method))
-        calls_metrics['Calls'].append(int(calls))
+    calls_metrics = {'Method': list(calls_by_method.keys()), 'Calls': list(calls_by_method.values())}
     df = pd.DataFrame(data=calls_metrics)
-    df['Method'] = df['Method'].apply(change_method_name_usage)
+    df['Method'] = normalize_unique(df['Method'], change_method_name_usage)
     return df
 
 